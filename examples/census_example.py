@@ -12,34 +12,44 @@ from pathlib import Path
 # Add src to path for import
 sys.path.insert(0, str(Path(__file__).parent / "src" / "census-data" / "src"))
 
+from dotenv import load_dotenv
+
 from us_data_mcp.census_data.api_client import CensusAPIClient
 
 
+def emit(lines):
+    """Write a section's lines to stdout in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 async def main():
     """Main demonstration function."""
     
+    load_dotenv()
+    
     # Check for API key
     api_key = os.getenv("CENSUS_API_KEY")
     if not api_key:
-        print("❌ Error: CENSUS_API_KEY environment variable not set")
-        print("\nTo get an API key:")
-        print("1. Visit https://api.census.gov/data/key_signup.html")
-        print("2. Fill out the form")
-        print("3. Check your email for the API key")
-        print("\nThen set it:")
-        print("  export CENSUS_API_KEY='your-key'  # Linux/macOS")
-        print("  $env:CENSUS_API_KEY='your-key'    # Windows PowerShell")
+        emit([
+            "❌ Error: CENSUS_API_KEY environment variable not set",
+            "\nTo get an API key:",
+            "1. Visit https://api.census.gov/data/key_signup.html",
+            "2. Fill out the form",
+            "3. Check your email for the API key",
+            "\nThen set it:",
+            "  export CENSUS_API_KEY='your-key'  # Linux/macOS",
+            "  $env:CENSUS_API_KEY='your-key'    # Windows PowerShell",
+        ])
         return
     
-    print("🚀 US Census Bureau API Client Demo\n")
-    print("=" * 60)
+    emit(["🚀 US Census Bureau API Client Demo\n", "=" * 60])
     
     # Initialize client
     async with CensusAPIClient(api_key=api_key) as client:
         
         # Example 1: Get population data for California
-        print("\n📊 Example 1: California Population (2020)")
-        print("-" * 60)
+        lines = ["\n📊 Example 1: California Population (2020)", "-" * 60]
         
         result = await client.get_population_data(
             year=2020,
@@ -47,17 +57,17 @@ async def main():
         )
         
         if result.success:
-            print(f"✅ Success! Found {result.metadata['count']} result(s)")
+            lines.append(f"✅ Success! Found {result.metadata['count']} result(s)")
             for data in result.data:
-                print(f"\n  Location: {data.get('NAME')}")
-                print(f"  Population: {data.get('B01001_001E', 'N/A'):,}")
-                print(f"  Median Age: {data.get('B01002_001E', 'N/A')}")
+                lines.append(f"\n  Location: {data.get('NAME')}")
+                lines.append(f"  Population: {data.get('B01001_001E', 'N/A'):,}")
+                lines.append(f"  Median Age: {data.get('B01002_001E', 'N/A')}")
         else:
-            print(f"❌ Error: {result.error}")
+            lines.append(f"❌ Error: {result.error}")
+        emit(lines)
         
         # Example 2: Get economic data for multiple states
-        print("\n\n💰 Example 2: Economic Data for Top 3 States (2021)")
-        print("-" * 60)
+        lines = ["\n\n💰 Example 2: Economic Data for Top 3 States (2021)", "-" * 60]
         
         states = [
             ("06", "California"),
@@ -65,60 +75,56 @@ async def main():
             ("12", "Florida")
         ]
         
-        for state_code, state_name in states:
-            result = await client.get_economic_data(
-                year=2021,
-                state=state_code,
-                geography=f"state:{state_code}"
-            )
-            
+        # Fan the requests out concurrently; the semaphore caps in-flight calls
+        # so larger state lists (e.g. all 50) don't flood the API
+        semaphore = asyncio.Semaphore(8)
+        
+        async def fetch_state(state_code):
+            async with semaphore:
+                return await client.get_economic_data(
+                    year=2021,
+                    state=state_code,
+                    geography=f"state:{state_code}"
+                )
+        
+        results = await asyncio.gather(
+            *(fetch_state(state_code) for state_code, _ in states)
+        )
+        
+        for (state_code, state_name), result in zip(states, results):
             if result.success and result.data:
                 data = result.data[0]
                 income = data.get('B19013_001E', 'N/A')
                 poverty = data.get('B17001_002E', 'N/A')
                 unemployment = data.get('B23025_005E', 'N/A')
                 
-                print(f"\n  {state_name}:")
-                print(f"    Median Household Income: ${income}")
-                print(f"    Below Poverty Level: {poverty}")
-                print(f"    Unemployed: {unemployment}")
+                lines.append(f"\n  {state_name}:")
+                lines.append(f"    Median Household Income: ${income}")
+                lines.append(f"    Below Poverty Level: {poverty}")
+                lines.append(f"    Unemployed: {unemployment}")
+        emit(lines)
         
         # Example 3: Show common variables
-        print("\n\n📋 Example 3: Common Census Variables")
-        print("-" * 60)
-        
-        from us_data_mcp.census_data.models import COMMON_VARIABLES
-        
-        categories = {
-            "Population": [],
-            "Economic": [],
-            "Housing": [],
-            "Education": []
-        }
+        lines = ["\n\n📋 Example 3: Common Census Variables", "-" * 60]
         
-        for code, label in COMMON_VARIABLES.items():
-            if "Population" in label or "Age" in label:
-                categories["Population"].append((code, label))
-            elif any(word in label for word in ["Income", "Poverty", "Unemployment"]):
-                categories["Economic"].append((code, label))
-            elif "Housing" in label or "Home" in label:
-                categories["Housing"].append((code, label))
-            elif "Degree" in label:
-                categories["Education"].append((code, label))
+        from us_data_mcp.census_data.models import VARIABLES_BY_CATEGORY
         
-        for category, variables in categories.items():
+        for category, variables in VARIABLES_BY_CATEGORY.items():
             if variables:
-                print(f"\n  {category}:")
-                for code, label in variables[:3]:  # Show first 3 of each category
-                    print(f"    {code}: {label}")
+                lines.append(f"\n  {category}:")
+                for code, label in list(variables.items())[:3]:  # Show first 3 of each category
+                    lines.append(f"    {code}: {label}")
+        emit(lines)
         
-    print("\n\n" + "=" * 60)
-    print("✨ Demo complete!")
-    print("\nNext steps:")
-    print("1. Try modifying the examples above")
-    print("2. Explore more variables from COMMON_VARIABLES")
-    print("3. Use with Claude Desktop or Cline via MCP")
-    print("\nSee QUICKSTART.md for more information!")
+    emit([
+        "\n\n" + "=" * 60,
+        "✨ Demo complete!",
+        "\nNext steps:",
+        "1. Try modifying the examples above",
+        "2. Explore more variables from COMMON_VARIABLES",
+        "3. Use with Claude Desktop or Cline via MCP",
+        "\nSee QUICKSTART.md for more information!",
+    ])
 
 
 if __name__ == "__main__":
@@ -1,20 +1,40 @@
 """BLS API client for accessing Bureau of Labor Statistics data."""
 
+import asyncio
 import os
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Tuple
 import httpx
-from dotenv import load_dotenv
+import ijson
+from async_lru import alru_cache
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+from us_data_mcp.common import AsyncByteStream
 
 from .models import BLSResponse, COMMON_SERIES
 
-# Load environment variables
-load_dotenv()
+# Network failures worth retrying; API-level errors are never retried
+_TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.RemoteProtocolError)
+
+# Read-only view handed out by get_common_series instead of a fresh copy per call
+_COMMON_SERIES_VIEW = MappingProxyType(COMMON_SERIES)
+
+
+class _BLSRequestNotProcessed(Exception):
+    """BLS API rejected the request (e.g. invalid series or exceeded daily quota)."""
 
 
 class BLSAPIClient:
     """Client for interacting with the Bureau of Labor Statistics (BLS) API."""
     
     BASE_URL = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
+    MAX_SERIES_PER_REQUEST = 50
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize BLS API client.
@@ -24,12 +44,18 @@ class BLSAPIClient:
         """
         self.api_key = api_key or os.getenv("BLS_API_KEY")
         self.client = httpx.AsyncClient(
+            http2=True,
             timeout=30.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
             headers={"Content-Type": "application/json"}
         )
+        
+        # Per-instance response cache; concurrent identical queries share one request
+        self._cached_fetch = alru_cache(maxsize=1024, ttl=3600)(self._fetch)
     
     async def close(self) -> None:
         """Close the HTTP client."""
+        self._cached_fetch.cache_clear()
         await self.client.aclose()
     
     async def __aenter__(self):
@@ -48,6 +74,9 @@ class BLSAPIClient:
     ) -> BLSResponse:
         """Fetch data for one or more BLS series.
         
+        Successful responses are cached per query for an hour; cached
+        responses are shared between callers and should be treated as read-only.
+        
         Args:
             series_ids: List of BLS series IDs
             start_year: Start year (optional)
@@ -57,51 +86,124 @@ class BLSAPIClient:
             BLSResponse with data
         """
         try:
-            payload = {
-                "seriesid": series_ids
-            }
-            
-            if start_year:
-                payload["startyear"] = str(start_year)
-            if end_year:
-                payload["endyear"] = str(end_year)
-            if self.api_key:
-                payload["registrationkey"] = self.api_key
-                
-            response = await self.client.post(self.BASE_URL, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get("status") == "REQUEST_NOT_PROCESSED":
-                return BLSResponse(
-                    status="FAIL",
-                    success=False,
-                    error=data.get("message", ["Unknown API error"])[0]
-                )
-            
-            results = data.get("Results", {}).get("series", [])
-            
-            # Add descriptions from common series if available
-            for series in results:
-                s_id = series.get("seriesID")
-                if s_id in COMMON_SERIES:
-                    series["description"] = COMMON_SERIES[s_id]
-            
+            return await self._cached_fetch(tuple(series_ids), start_year, end_year)
+        
+        except _BLSRequestNotProcessed as e:
             return BLSResponse(
-                status=data.get("status", "OK"),
-                data=results,
-                message=data.get("message"),
-                success=True
+                status="FAIL",
+                success=False,
+                error=str(e)
             )
-            
         except Exception as e:
             return BLSResponse(
                 status="ERROR",
                 success=False,
                 error=str(e)
             )
+    
+    async def get_series_data_many(
+        self,
+        series_ids: List[str],
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None
+    ) -> BLSResponse:
+        """Fetch any number of BLS series, splitting them across concurrent requests.
+        
+        The BLS API accepts at most 50 series per request, so longer lists are
+        sent in chunks of 50 (at most four in flight) and the results merged.
+        
+        Args:
+            series_ids: List of BLS series IDs
+            start_year: Start year (optional)
+            end_year: End year (optional)
+            
+        Returns:
+            BLSResponse with data for all series, or the first failed chunk's error
+        """
+        size = self.MAX_SERIES_PER_REQUEST
+        if len(series_ids) <= size:
+            return await self.get_series_data(series_ids, start_year, end_year)
+        
+        semaphore = asyncio.Semaphore(4)
+        
+        async def fetch_chunk(chunk: List[str]) -> BLSResponse:
+            async with semaphore:
+                return await self.get_series_data(chunk, start_year, end_year)
+        
+        responses = await asyncio.gather(*(
+            fetch_chunk(series_ids[i:i + size]) for i in range(0, len(series_ids), size)
+        ))
+        
+        for response in responses:
+            if not response.success:
+                return response
+        
+        messages = [message for response in responses for message in response.message or []]
+        return BLSResponse.model_construct(
+            status=responses[0].status,
+            data=[series for response in responses for series in response.data],
+            message=messages or None,
+            success=True
+        )
+    
+    async def _fetch(
+        self,
+        series_ids: Tuple[str, ...],
+        start_year: Optional[int],
+        end_year: Optional[int]
+    ) -> BLSResponse:
+        """Fetch series data, raising on failure so errors are never cached."""
+        payload = {
+            "seriesid": list(series_ids)
+        }
+        
+        if start_year:
+            payload["startyear"] = str(start_year)
+        if end_year:
+            payload["endyear"] = str(end_year)
+        if self.api_key:
+            payload["registrationkey"] = self.api_key
+            
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=0.1, max=2) + wait_random(0, 0.1),
+            retry=retry_if_exception_type(_TRANSIENT_ERRORS),
+            reraise=True
+        ):
+            with attempt:
+                async with self.client.stream("POST", self.BASE_URL, json=payload) as response:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    
+                    # Decode top-level fields as the body arrives instead of
+                    # buffering the whole response first
+                    data = {
+                        key: value
+                        async for key, value in ijson.kvitems_async(
+                            AsyncByteStream(response.aiter_bytes()), "", use_float=True
+                        )
+                    }
+        
+        if data.get("status") == "REQUEST_NOT_PROCESSED":
+            raise _BLSRequestNotProcessed(data.get("message", ["Unknown API error"])[0])
+        
+        results = data.get("Results", {}).get("series", [])
+        
+        # Add descriptions from common series if available
+        for series in results:
+            s_id = series.get("seriesID")
+            if s_id in COMMON_SERIES:
+                series["description"] = COMMON_SERIES[s_id]
+        
+        # Payload comes straight from the API; skip re-validating every row
+        return BLSResponse.model_construct(
+            status=data.get("status", "OK"),
+            data=results,
+            message=data.get("message"),
+            success=True
+        )
 
-    async def get_common_series(self) -> Dict[str, str]:
-        """Return common series IDs and descriptions."""
-        return COMMON_SERIES.copy()
+    async def get_common_series(self) -> Mapping[str, str]:
+        """Return a read-only view of common series IDs and descriptions."""
+        return _COMMON_SERIES_VIEW
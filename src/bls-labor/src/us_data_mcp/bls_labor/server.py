@@ -5,21 +5,38 @@ This server provides MCP tools for accessing BLS labor market and economic data.
 
 import asyncio
 import json
-from typing import Any, Optional
+import os
+from typing import Any
 
+from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from us_data_mcp.common import SharedClient
+
 from .api_client import BLSAPIClient
 from .models import BLSSeriesRequest, COMMON_SERIES
 
 
+# Compact JSON by default; set US_DATA_MCP_PRETTY=1 for indented output when debugging
+_INDENT = 2 if os.getenv("US_DATA_MCP_PRETTY") else None
+_SEPARATORS = (",", ": ") if _INDENT else (",", ":")
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON text."""
+    return json.dumps(obj, indent=_INDENT, separators=_SEPARATORS)
+
+
 # Initialize MCP server
 app = Server("us-data-mcp.bls-labor")
 
 # Global API client
-bls_client: Optional[BLSAPIClient] = None
+bls_client = SharedClient(BLSAPIClient)
+
+# The common series table is static, so serialize it once instead of per call
+_COMMON_SERIES_JSON = _dumps({"common_series": COMMON_SERIES})
 
 
 @app.list_tools()
@@ -69,42 +86,37 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls for BLS operations."""
-    global bls_client
-    
     try:
-        if bls_client is None:
-            bls_client = BLSAPIClient()
+        client = await bls_client.get()
             
         if name == "get_series_data":
             request = BLSSeriesRequest(**arguments)
-            response = await bls_client.get_series_data(
+            response = await client.get_series_data_many(
                 series_ids=request.series_ids,
                 start_year=request.start_year,
                 end_year=request.end_year
             )
-            return [TextContent(type="text", text=json.dumps(response.model_dump(), indent=2))]
+            return [TextContent(type="text", text=response.model_dump_json(indent=_INDENT))]
             
         elif name == "get_common_series":
-            series = await bls_client.get_common_series()
-            return [TextContent(type="text", text=json.dumps({"common_series": series}, indent=2))]
+            return [TextContent(type="text", text=_COMMON_SERIES_JSON)]
             
         else:
-            return [TextContent(type="text", text=json.dumps({"success": False, "error": f"Unknown tool: {name}"}, indent=2))]
+            return [TextContent(type="text", text=_dumps({"success": False, "error": f"Unknown tool: {name}"}))]
             
     except Exception as e:
-        return [TextContent(type="text", text=json.dumps({"success": False, "error": str(e)}, indent=2))]
+        return [TextContent(type="text", text=_dumps({"success": False, "error": str(e)}))]
 
 
 async def main():
     """Main entry point for the BLS MCP server."""
-    global bls_client
+    load_dotenv()
     try:
-        bls_client = BLSAPIClient()
+        await bls_client.get()
         async with stdio_server() as (read_stream, write_stream):
             await app.run(read_stream, write_stream, app.create_initialization_options())
     finally:
-        if bls_client:
-            await bls_client.close()
+        await bls_client.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""Tests for BLS API client."""
+
+from contextlib import asynccontextmanager
+
+import httpx
+import orjson
+import pytest
+from unittest.mock import MagicMock, patch
+from us_data_mcp.bls_labor.api_client import BLSAPIClient
+
+
+def mock_stream(handler):
+    """Build a stand-in for AsyncClient.stream that answers each POST with handler(series_ids)."""
+    @asynccontextmanager
+    async def stream(method, url, json=None, **kwargs):
+        yield httpx.Response(
+            200,
+            content=orjson.dumps(handler(json["seriesid"])),
+            request=httpx.Request(method, url)
+        )
+    return stream
+
+
+def series_payload(series_ids):
+    """Build a successful BLS response with one empty series per ID."""
+    return {
+        "status": "REQUEST_SUCCEEDED",
+        "message": [f"{len(series_ids)} series"],
+        "Results": {"series": [{"seriesID": s_id, "data": []} for s_id in series_ids]}
+    }
+
+
+@pytest.fixture
+async def bls_client():
+    """Fixture for BLS API client."""
+    client = BLSAPIClient(api_key="test_api_key")
+    yield client
+    await client.close()
+
+
+class TestSeriesDataMany:
+    """Test cases for BLSAPIClient.get_series_data_many."""
+    
+    @pytest.mark.asyncio
+    async def test_splits_at_series_limit(self, bls_client):
+        """Test long series lists are sent in chunks of at most 50 and merged in order."""
+        series_ids = [f"SERIES{i:03d}" for i in range(120)]
+        stream = MagicMock(side_effect=mock_stream(series_payload))
+        
+        with patch.object(bls_client.client, "stream", stream):
+            result = await bls_client.get_series_data_many(series_ids, 2020, 2024)
+        
+        sent = [call.kwargs["json"]["seriesid"] for call in stream.call_args_list]
+        assert sorted(len(chunk) for chunk in sent) == [20, 50, 50]
+        assert sorted(s_id for chunk in sent for s_id in chunk) == series_ids
+        assert all(call.kwargs["json"]["startyear"] == "2020" for call in stream.call_args_list)
+        
+        assert result.success is True
+        assert [series["seriesID"] for series in result.data] == series_ids
+        assert sorted(result.message) == ["20 series", "50 series", "50 series"]
+    
+    @pytest.mark.asyncio
+    async def test_limit_sized_list_is_one_request(self, bls_client):
+        """Test exactly 50 series still go out as a single request."""
+        series_ids = [f"SERIES{i:03d}" for i in range(BLSAPIClient.MAX_SERIES_PER_REQUEST)]
+        stream = MagicMock(side_effect=mock_stream(series_payload))
+        
+        with patch.object(bls_client.client, "stream", stream):
+            result = await bls_client.get_series_data_many(series_ids)
+        
+        assert result.success is True
+        assert len(result.data) == 50
+        assert stream.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_chunk_fails_the_batch(self, bls_client):
+        """Test a chunk rejected by BLS is reported instead of a partial merge."""
+        def handler(series_ids):
+            if "BAD" in series_ids:
+                return {"status": "REQUEST_NOT_PROCESSED", "message": ["Invalid series BAD"]}
+            return series_payload(series_ids)
+        
+        series_ids = [f"SERIES{i:03d}" for i in range(60)] + ["BAD"]
+        
+        with patch.object(bls_client.client, "stream", mock_stream(handler)):
+            result = await bls_client.get_series_data_many(series_ids)
+        
+        assert result.success is False
+        assert result.status == "FAIL"
+        assert result.error == "Invalid series BAD"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
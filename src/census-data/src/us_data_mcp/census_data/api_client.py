@@ -1,14 +1,57 @@
 """Census API client for making HTTP requests to the US Census Bureau API."""
 
 import os
-from typing import Dict, Any, List, Optional
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Any, Optional, Sequence, Tuple
 import httpx
-from dotenv import load_dotenv
+import ijson
+import orjson
+from async_lru import alru_cache
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
+
+from us_data_mcp.common import AsyncByteStream
 
 from .models import CensusResponse, COMMON_VARIABLES
 
-# Load environment variables
-load_dotenv()
+
+# Default variable sets for the convenience helpers, NAME first
+_POPULATION_VARIABLES = ("NAME", "B01001_001E", "B01002_001E")  # Name, Total Pop, Median Age
+_ECONOMIC_VARIABLES = (
+    "NAME",
+    "B19013_001E",  # Median Household Income
+    "B17001_002E",  # Below Poverty Level
+    "B23025_005E"   # Unemployment
+)
+
+
+_STATE_FIPS_RE = re.compile(r"[0-9]{2}")
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Return True for failures worth retrying: timeouts, dropped connections and 5xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TimeoutException, httpx.RemoteProtocolError))
+
+
+@lru_cache(maxsize=256)
+def _vars_to_get(variables: Tuple[str, ...]) -> str:
+    """Join variable codes into the ``get`` parameter, memoized for repeated lists."""
+    return ",".join(variables)
+
+
+@lru_cache(maxsize=256)
+def _row_type(headers: Tuple[str, ...]) -> type:
+    """Return a namedtuple row class for a header row, built once per header set."""
+    return namedtuple("CensusRow", headers, rename=True)
 
 
 class CensusAPIClient:
@@ -31,12 +74,18 @@ class CensusAPIClient:
             )
         
         self.client = httpx.AsyncClient(
+            http2=True,
             timeout=30.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
             headers={"User-Agent": "US-Data-MCP-Census-Server/0.1.0"}
         )
+        
+        # Per-instance response cache; concurrent identical queries share one request
+        self._cached_fetch = alru_cache(maxsize=1024, ttl=3600)(self._fetch)
     
     async def close(self) -> None:
         """Close the HTTP client."""
+        self._cached_fetch.cache_clear()
         await self.client.aclose()
     
     async def __aenter__(self):
@@ -61,7 +110,7 @@ class CensusAPIClient:
     
     def _build_params(
         self,
-        variables: List[str],
+        variables: Sequence[str],
         geography: str,
         state: Optional[str] = None,
         county: Optional[str] = None
@@ -78,7 +127,7 @@ class CensusAPIClient:
             Query parameters dict
         """
         params = {
-            "get": ",".join(variables),
+            "get": _vars_to_get(tuple(variables)),
             "key": self.api_key
         }
         
@@ -100,13 +149,19 @@ class CensusAPIClient:
         self,
         year: int,
         dataset: str,
-        variables: List[str],
+        variables: Sequence[str],
         geography: str,
         state: Optional[str] = None,
-        county: Optional[str] = None
+        county: Optional[str] = None,
+        columnar: bool = False,
+        as_tuples: bool = False
     ) -> CensusResponse:
         """Fetch data from Census API.
         
+        Successful responses are cached per query for an hour, since published
+        Census releases do not change; cached responses are shared between
+        callers and should be treated as read-only.
+        
         Args:
             year: Year of data
             dataset: Dataset identifier
@@ -114,54 +169,34 @@ class CensusAPIClient:
             geography: Geographic level
             state: State FIPS code (optional)
             county: County FIPS code (optional)
+            columnar: Return a single dict mapping each column to its list of
+                values instead of one dict per row (for bulk aggregation)
+            as_tuples: Return each row as a namedtuple keyed by the response
+                headers instead of a dict (smaller per-row footprint); rows
+                serialize to JSON as arrays
             
         Returns:
             CensusResponse with data or error
         """
-        try:
-            url = self._build_url(year, dataset)
-            params = self._build_params(variables, geography, state, county)
-            
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Census API returns data as list of lists with first row as headers
-            if len(data) < 2:
-                return CensusResponse(
-                    data=[],
-                    metadata={
-                        "year": year,
-                        "dataset": dataset,
-                        "variables": variables
-                    },
-                    success=True
-                )
-            
-            headers = data[0]
-            rows = data[1:]
-            
-            # Convert to list of dicts
-            formatted_data = [
-                dict(zip(headers, row)) for row in rows
-            ]
-            
-            # Add variable descriptions
-            metadata = {
-                "year": year,
-                "dataset": dataset,
-                "variables": {
-                    var: COMMON_VARIABLES.get(var, f"Variable {var}")
-                    for var in variables
-                },
-                "count": len(formatted_data)
-            }
-            
+        # Reject requests the API would refuse without a round-trip
+        error = None
+        if not variables:
+            error = "At least one variable is required"
+        elif not 2000 <= year <= 2030:
+            error = f"Year must be between 2000 and 2030, got {year}"
+        elif state is not None and not _STATE_FIPS_RE.fullmatch(state):
+            error = f"State must be a 2-digit FIPS code, got {state!r}"
+        if error:
             return CensusResponse(
-                data=formatted_data,
-                metadata=metadata,
-                success=True
+                data=[],
+                metadata={"year": year, "dataset": dataset},
+                success=False,
+                error=error
+            )
+        
+        try:
+            return await self._cached_fetch(
+                year, dataset, tuple(variables), geography, state, county, columnar, as_tuples
             )
             
         except httpx.HTTPStatusError as e:
@@ -180,12 +215,95 @@ class CensusAPIClient:
                 error=str(e)
             )
     
+    async def _fetch(
+        self,
+        year: int,
+        dataset: str,
+        variables: Tuple[str, ...],
+        geography: str,
+        state: Optional[str],
+        county: Optional[str],
+        columnar: bool,
+        as_tuples: bool
+    ) -> CensusResponse:
+        """Fetch and format Census API data, raising on failure so errors are never cached."""
+        url = self._build_url(year, dataset)
+        params = self._build_params(variables, geography, state, county)
+        
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=0.1, max=2) + wait_random(0, 0.1),
+            retry=retry_if_exception(_is_transient),
+            reraise=True
+        ):
+            with attempt:
+                async with self.client.stream("GET", url, params=params) as response:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    
+                    # Census API returns data as list of lists with first row as headers.
+                    # Rows are decoded as the body arrives so the raw bytes are never
+                    # held in memory alongside the parsed rows.
+                    rows = ijson.items_async(
+                        AsyncByteStream(response.aiter_bytes()), "item", use_float=True
+                    )
+                    headers = await anext(rows, None) or []
+                    
+                    if columnar:
+                        # One list per column instead of one dict per row
+                        columns = {header: [] for header in headers}
+                        column_values = list(columns.values())
+                        count = 0
+                        async for row in rows:
+                            for values, value in zip(column_values, row):
+                                values.append(value)
+                            count += 1
+                        formatted_data = [columns]
+                    elif as_tuples:
+                        row_type = _row_type(tuple(headers))
+                        formatted_data = [row_type._make(row) async for row in rows]
+                        count = len(formatted_data)
+                    else:
+                        # Convert to list of dicts
+                        formatted_data = [dict(zip(headers, row)) async for row in rows]
+                        count = len(formatted_data)
+                
+        if count == 0:
+            return CensusResponse.model_construct(
+                data=[],
+                metadata={
+                    "year": year,
+                    "dataset": dataset,
+                    "variables": list(variables)
+                },
+                success=True
+            )
+        
+        # Add variable descriptions
+        metadata = {
+            "year": year,
+            "dataset": dataset,
+            "variables": {
+                var: COMMON_VARIABLES.get(var, f"Variable {var}")
+                for var in variables
+            },
+            "count": count
+        }
+        
+        # Rows are already well-formed; skip re-validating every cell
+        return CensusResponse.model_construct(
+            data=formatted_data,
+            metadata=metadata,
+            success=True
+        )
+    
     async def get_population_data(
         self,
         year: int,
         state: str,
         county: Optional[str] = None,
-        variables: Optional[List[str]] = None
+        variables: Optional[Sequence[str]] = None
     ) -> CensusResponse:
         """Get population data for a geographic area.
         
@@ -199,11 +317,9 @@ class CensusAPIClient:
             CensusResponse with population data
         """
         if variables is None:
-            variables = ["NAME", "B01001_001E", "B01002_001E"]  # Name, Total Pop, Median Age
-        
-        # Ensure NAME is included
-        if "NAME" not in variables:
-            variables = ["NAME"] + variables
+            variables = _POPULATION_VARIABLES
+        elif "NAME" not in variables:
+            variables = ("NAME", *variables)
         
         dataset = "acs/acs5"  # 5-year American Community Survey
         geography = "county:*" if county else f"state:{state}"
@@ -221,7 +337,7 @@ class CensusAPIClient:
         self,
         year: int,
         dataset: str = "acs/acs5",
-        variables: Optional[List[str]] = None,
+        variables: Optional[Sequence[str]] = None,
         geography: str = "state:*",
         state: Optional[str] = None
     ) -> CensusResponse:
@@ -238,16 +354,9 @@ class CensusAPIClient:
             CensusResponse with economic data
         """
         if variables is None:
-            variables = [
-                "NAME",
-                "B19013_001E",  # Median Household Income
-                "B17001_002E",  # Below Poverty Level
-                "B23025_005E"   # Unemployment
-            ]
-        
-        # Ensure NAME is included
-        if "NAME" not in variables:
-            variables = ["NAME"] + variables
+            variables = _ECONOMIC_VARIABLES
+        elif "NAME" not in variables:
+            variables = ("NAME", *variables)
         
         return await self.get_data(
             year=year,
@@ -271,6 +380,6 @@ class CensusAPIClient:
             url = f"{self.BASE_URL}/{year}/{dataset}/variables.json"
             response = await self.client.get(url)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             return {"error": str(e), "common_variables": COMMON_VARIABLES}
@@ -1,6 +1,8 @@
 """Pydantic models for Census API requests and responses."""
 
-from typing import Optional, List, Dict, Any
+import hashlib
+import json
+from typing import Optional, List, Dict, Any, Tuple, Union
 from pydantic import BaseModel, Field
 
 
@@ -8,8 +10,8 @@ class PopulationSearchRequest(BaseModel):
     """Request model for population data search."""
     
     year: int = Field(..., description="Year of census data", ge=2000, le=2030)
-    state: str = Field(..., description="State FIPS code (2 digits)", min_length=2, max_length=2)
-    county: Optional[str] = Field(None, description="County FIPS code (3 digits)", min_length=3, max_length=3)
+    state: str = Field(..., description="State FIPS code (2 digits)", pattern=r"^[0-9]{2}$")
+    county: Optional[str] = Field(None, description="County FIPS code (3 digits)", pattern=r"^[0-9]{3}$")
     variables: List[str] = Field(
         default=["NAME", "B01001_001E"],
         description="Census variables to retrieve (e.g., B01001_001E for total population)"
@@ -32,7 +34,7 @@ class EconomicSearchRequest(BaseModel):
         default="state:*",
         description="Geographic level (e.g., 'state:*', 'county:*')"
     )
-    state: Optional[str] = Field(None, description="State FIPS code filter (2 digits)")
+    state: Optional[str] = Field(None, description="State FIPS code filter (2 digits)", pattern=r"^[0-9]{2}$")
 
 
 class CensusDataPoint(BaseModel):
@@ -48,7 +50,7 @@ class CensusDataPoint(BaseModel):
 class CensusResponse(BaseModel):
     """Response model for census data."""
     
-    data: List[Dict[str, Any]] = Field(default_factory=list, description="Census data results")
+    data: List[Union[Dict[str, Any], Tuple[Any, ...]]] = Field(default_factory=list, description="Census data results (dicts, or row tuples when as_tuples is set)")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Response metadata")
     success: bool = Field(default=True, description="Whether request was successful")
     error: Optional[str] = Field(None, description="Error message if request failed")
@@ -95,3 +97,49 @@ COMMON_VARIABLES = {
     "B02001_005E": "Asian Alone",
     "B03001_003E": "Hispanic or Latino",
 }
+
+
+# State and territory FIPS codes
+STATE_FIPS = {
+    "Alabama": "01", "Alaska": "02", "Arizona": "04", "Arkansas": "05",
+    "California": "06", "Colorado": "08", "Connecticut": "09", "Delaware": "10",
+    "Florida": "12", "Georgia": "13", "Hawaii": "15", "Idaho": "16",
+    "Illinois": "17", "Indiana": "18", "Iowa": "19", "Kansas": "20",
+    "Kentucky": "21", "Louisiana": "22", "Maine": "23", "Maryland": "24",
+    "Massachusetts": "25", "Michigan": "26", "Minnesota": "27", "Mississippi": "28",
+    "Missouri": "29", "Montana": "30", "Nebraska": "31", "Nevada": "32",
+    "New Hampshire": "33", "New Jersey": "34", "New Mexico": "35", "New York": "36",
+    "North Carolina": "37", "North Dakota": "38", "Ohio": "39", "Oklahoma": "40",
+    "Oregon": "41", "Pennsylvania": "42", "Rhode Island": "44", "South Carolina": "45",
+    "South Dakota": "46", "Tennessee": "47", "Texas": "48", "Utah": "49",
+    "Vermont": "50", "Virginia": "51", "Washington": "53", "West Virginia": "54",
+    "Wisconsin": "55", "Wyoming": "56", "District of Columbia": "11",
+    "Puerto Rico": "72"
+}
+
+
+# Label keywords used to group COMMON_VARIABLES by topic
+_CATEGORY_KEYWORDS = {
+    "Population": ("Population", "Age"),
+    "Economic": ("Income", "Poverty", "Unemployment"),
+    "Housing": ("Housing", "Home"),
+    "Education": ("Degree", "Bachelor", "Master", "Doctorate"),
+    "Demographics": ("White", "Black", "Asian", "Hispanic", "Indian"),
+}
+
+# COMMON_VARIABLES grouped by category, built once at import
+VARIABLES_BY_CATEGORY = {
+    category: {
+        code: label
+        for code, label in COMMON_VARIABLES.items()
+        if any(word in label for word in keywords)
+    }
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+}
+
+
+# Content hash of the static reference tables, so callers can tell when a
+# cached copy of get_common_variables / get_state_fips output is stale
+REFERENCE_VERSION = hashlib.sha256(
+    json.dumps([COMMON_VARIABLES, STATE_FIPS], sort_keys=True).encode()
+).hexdigest()[:12]
@@ -4,9 +4,11 @@ This server provides MCP tools for accessing US Census Bureau data through the C
 """
 
 import asyncio
-import json
-from typing import Any, Optional
+import os
+from typing import Any
 
+import orjson
+from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -18,15 +20,155 @@ from mcp.types import (
     INTERNAL_ERROR,
 )
 
+from us_data_mcp.common import SharedClient
+
 from .api_client import CensusAPIClient
-from .models import PopulationSearchRequest, EconomicSearchRequest, COMMON_VARIABLES
+from .models import (
+    PopulationSearchRequest,
+    EconomicSearchRequest,
+    REFERENCE_VERSION,
+    STATE_FIPS,
+    VARIABLES_BY_CATEGORY,
+)
+
+
+# Compact JSON by default; set US_DATA_MCP_PRETTY=1 for indented output when debugging
+_INDENT = 2 if os.getenv("US_DATA_MCP_PRETTY") else None
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 if _INDENT else 0
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON text."""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+
+# The common variables reference is static, so serialize it once at import
+_COMMON_VARIABLES_RESPONSE = _dumps({
+    "version": REFERENCE_VERSION,
+    "common_variables": VARIABLES_BY_CATEGORY,
+    "usage": "Use these variable codes in the 'variables' parameter of search_population or search_economic tools"
+})
+
+# State FIPS lookups: lowercase name -> (name, code), plus the full listing
+_STATE_FIPS_LOWER = {state.lower(): (state, code) for state, code in STATE_FIPS.items()}
+_ALL_STATES_RESPONSE = _dumps({"version": REFERENCE_VERSION, "state_fips_codes": STATE_FIPS})
 
 
 # Initialize MCP server
 app = Server("us-data-mcp.census-data")
 
 # Global API client
-census_client: Optional[CensusAPIClient] = None
+census_client = SharedClient(CensusAPIClient)
+
+# Tool definitions are static, so build them once at import
+_TOOLS = [
+    Tool(
+        name="search_population",
+        description=(
+            "Search US Census population data by geography. "
+            "Returns population statistics including total population, median age, "
+            "and other demographic data for states and counties."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Year of census data (e.g., 2020, 2021)",
+                    "minimum": 2000,
+                    "maximum": 2030
+                },
+                "state": {
+                    "type": "string",
+                    "description": "State FIPS code (2 digits, e.g., '06' for California)",
+                    "pattern": "^[0-9]{2}$"
+                },
+                "county": {
+                    "type": "string",
+                    "description": "County FIPS code (3 digits, optional)",
+                    "pattern": "^[0-9]{3}$"
+                },
+                "variables": {
+                    "type": "array",
+                    "description": "List of census variable codes to retrieve",
+                    "items": {"type": "string"},
+                    "default": ["NAME", "B01001_001E", "B01002_001E"]
+                }
+            },
+            "required": ["year", "state"]
+        }
+    ),
+    Tool(
+        name="search_economic",
+        description=(
+            "Search US Census economic indicators data. "
+            "Returns economic data including median household income, poverty rates, "
+            "unemployment, and other economic indicators."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Year of data",
+                    "minimum": 2000,
+                    "maximum": 2030
+                },
+                "dataset": {
+                    "type": "string",
+                    "description": "Dataset name (default: 'acs/acs5' for 5-year American Community Survey)",
+                    "default": "acs/acs5"
+                },
+                "variables": {
+                    "type": "array",
+                    "description": "List of economic variable codes",
+                    "items": {"type": "string"},
+                    "default": ["NAME", "B19013_001E", "B17001_002E", "B23025_005E"]
+                },
+                "geography": {
+                    "type": "string",
+                    "description": "Geographic level (e.g., 'state:*', 'county:*')",
+                    "default": "state:*"
+                },
+                "state": {
+                    "type": "string",
+                    "description": "State FIPS code filter (2 digits, optional)",
+                    "pattern": "^[0-9]{2}$"
+                }
+            },
+            "required": ["year"]
+        }
+    ),
+    Tool(
+        name="get_common_variables",
+        description=(
+            "Get a reference list of commonly used Census variables with their descriptions. "
+            "This helps identify which variables to use in population and economic searches."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_state_fips",
+        description=(
+            "Get FIPS codes for US states. Returns a mapping of state names to their "
+            "2-digit FIPS codes used in Census API queries."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_name": {
+                    "type": "string",
+                    "description": "State name to look up (optional, returns all if not provided)"
+                }
+            },
+            "required": []
+        }
+    )
+]
 
 
 @app.list_tools()
@@ -36,114 +178,106 @@ async def list_tools() -> list[Tool]:
     Returns:
         List of available tools
     """
-    return [
-        Tool(
-            name="search_population",
-            description=(
-                "Search US Census population data by geography. "
-                "Returns population statistics including total population, median age, "
-                "and other demographic data for states and counties."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Year of census data (e.g., 2020, 2021)",
-                        "minimum": 2000,
-                        "maximum": 2030
-                    },
-                    "state": {
-                        "type": "string",
-                        "description": "State FIPS code (2 digits, e.g., '06' for California)",
-                        "pattern": "^[0-9]{2}$"
-                    },
-                    "county": {
-                        "type": "string",
-                        "description": "County FIPS code (3 digits, optional)",
-                        "pattern": "^[0-9]{3}$"
-                    },
-                    "variables": {
-                        "type": "array",
-                        "description": "List of census variable codes to retrieve",
-                        "items": {"type": "string"},
-                        "default": ["NAME", "B01001_001E", "B01002_001E"]
-                    }
-                },
-                "required": ["year", "state"]
-            }
-        ),
-        Tool(
-            name="search_economic",
-            description=(
-                "Search US Census economic indicators data. "
-                "Returns economic data including median household income, poverty rates, "
-                "unemployment, and other economic indicators."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Year of data",
-                        "minimum": 2000,
-                        "maximum": 2030
-                    },
-                    "dataset": {
-                        "type": "string",
-                        "description": "Dataset name (default: 'acs/acs5' for 5-year American Community Survey)",
-                        "default": "acs/acs5"
-                    },
-                    "variables": {
-                        "type": "array",
-                        "description": "List of economic variable codes",
-                        "items": {"type": "string"},
-                        "default": ["NAME", "B19013_001E", "B17001_002E", "B23025_005E"]
-                    },
-                    "geography": {
-                        "type": "string",
-                        "description": "Geographic level (e.g., 'state:*', 'county:*')",
-                        "default": "state:*"
-                    },
-                    "state": {
-                        "type": "string",
-                        "description": "State FIPS code filter (2 digits, optional)",
-                        "pattern": "^[0-9]{2}$"
-                    }
-                },
-                "required": ["year"]
-            }
-        ),
-        Tool(
-            name="get_common_variables",
-            description=(
-                "Get a reference list of commonly used Census variables with their descriptions. "
-                "This helps identify which variables to use in population and economic searches."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_state_fips",
-            description=(
-                "Get FIPS codes for US states. Returns a mapping of state names to their "
-                "2-digit FIPS codes used in Census API queries."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_name": {
-                        "type": "string",
-                        "description": "State name to look up (optional, returns all if not provided)"
-                    }
-                },
-                "required": []
-            }
-        )
-    ]
+    return _TOOLS
+
+
+async def _search_population(arguments: Any) -> list[TextContent]:
+    """Handle the search_population tool."""
+    # Validate request
+    try:
+        request = PopulationSearchRequest.model_validate(arguments)
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "success": False,
+                "error": f"Invalid parameters: {str(e)}"
+            })
+        )]
+    
+    # Get population data
+    client = await census_client.get()
+    response = await client.get_population_data(
+        year=request.year,
+        state=request.state,
+        county=request.county,
+        variables=request.variables
+    )
+    
+    return [TextContent(
+        type="text",
+        text=response.model_dump_json(indent=_INDENT)
+    )]
+
+
+async def _search_economic(arguments: Any) -> list[TextContent]:
+    """Handle the search_economic tool."""
+    # Validate request
+    try:
+        request = EconomicSearchRequest.model_validate(arguments)
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "success": False,
+                "error": f"Invalid parameters: {str(e)}"
+            })
+        )]
+    
+    # Get economic data
+    client = await census_client.get()
+    response = await client.get_economic_data(
+        year=request.year,
+        dataset=request.dataset,
+        variables=request.variables,
+        geography=request.geography,
+        state=request.state
+    )
+    
+    return [TextContent(
+        type="text",
+        text=response.model_dump_json(indent=_INDENT)
+    )]
+
+
+async def _common_variables(arguments: Any) -> list[TextContent]:
+    """Handle the get_common_variables tool."""
+    return [TextContent(type="text", text=_COMMON_VARIABLES_RESPONSE)]
+
+
+async def _state_fips(arguments: Any) -> list[TextContent]:
+    """Handle the get_state_fips tool."""
+    state_name = arguments.get("state_name")
+    if not state_name:
+        return [TextContent(type="text", text=_ALL_STATES_RESPONSE)]
+    
+    # Case-insensitive lookup
+    match = _STATE_FIPS_LOWER.get(state_name.lower())
+    if match:
+        state, code = match
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "state": state,
+                "fips_code": code
+            })
+        )]
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "success": False,
+            "error": f"State '{state_name}' not found"
+        })
+    )]
+
+
+# Tool name -> handler
+_HANDLERS = {
+    "search_population": _search_population,
+    "search_economic": _search_economic,
+    "get_common_variables": _common_variables,
+    "get_state_fips": _state_fips,
+}
 
 
 @app.call_tool()
@@ -157,158 +291,35 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     Returns:
         List of text content responses
     """
-    global census_client
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(
+            type="text",
+            text=_dumps({
+                "success": False,
+                "error": f"Unknown tool: {name}"
+            })
+        )]
     
     try:
-        if name == "search_population":
-            # Validate request
-            try:
-                request = PopulationSearchRequest(**arguments)
-            except Exception as e:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "success": False,
-                        "error": f"Invalid parameters: {str(e)}"
-                    }, indent=2)
-                )]
-            
-            # Get population data
-            if census_client is None:
-                census_client = CensusAPIClient()
-            
-            response = await census_client.get_population_data(
-                year=request.year,
-                state=request.state,
-                county=request.county,
-                variables=request.variables
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(response.model_dump(), indent=2)
-            )]
-        
-        elif name == "search_economic":
-            # Validate request
-            try:
-                request = EconomicSearchRequest(**arguments)
-            except Exception as e:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "success": False,
-                        "error": f"Invalid parameters: {str(e)}"
-                    }, indent=2)
-                )]
-            
-            # Get economic data
-            if census_client is None:
-                census_client = CensusAPIClient()
-            
-            response = await census_client.get_economic_data(
-                year=request.year,
-                dataset=request.dataset,
-                variables=request.variables,
-                geography=request.geography,
-                state=request.state
-            )
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps(response.model_dump(), indent=2)
-            )]
-        
-        elif name == "get_common_variables":
-            # Return common variables reference
-            variables_by_category = {
-                "Population": {k: v for k, v in COMMON_VARIABLES.items() if "Population" in v or "Age" in v},
-                "Economic": {k: v for k, v in COMMON_VARIABLES.items() if any(word in v for word in ["Income", "Poverty", "Unemployment"])},
-                "Housing": {k: v for k, v in COMMON_VARIABLES.items() if "Housing" in v or "Home" in v},
-                "Education": {k: v for k, v in COMMON_VARIABLES.items() if any(word in v for word in ["Degree", "Bachelor", "Master", "Doctorate"])},
-                "Demographics": {k: v for k, v in COMMON_VARIABLES.items() if any(word in v for word in ["White", "Black", "Asian", "Hispanic", "Indian"])}
-            }
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "common_variables": variables_by_category,
-                    "usage": "Use these variable codes in the 'variables' parameter of search_population or search_economic tools"
-                }, indent=2)
-            )]
-        
-        elif name == "get_state_fips":
-            # Return state FIPS codes
-            state_fips = {
-                "Alabama": "01", "Alaska": "02", "Arizona": "04", "Arkansas": "05",
-                "California": "06", "Colorado": "08", "Connecticut": "09", "Delaware": "10",
-                "Florida": "12", "Georgia": "13", "Hawaii": "15", "Idaho": "16",
-                "Illinois": "17", "Indiana": "18", "Iowa": "19", "Kansas": "20",
-                "Kentucky": "21", "Louisiana": "22", "Maine": "23", "Maryland": "24",
-                "Massachusetts": "25", "Michigan": "26", "Minnesota": "27", "Mississippi": "28",
-                "Missouri": "29", "Montana": "30", "Nebraska": "31", "Nevada": "32",
-                "New Hampshire": "33", "New Jersey": "34", "New Mexico": "35", "New York": "36",
-                "North Carolina": "37", "North Dakota": "38", "Ohio": "39", "Oklahoma": "40",
-                "Oregon": "41", "Pennsylvania": "42", "Rhode Island": "44", "South Carolina": "45",
-                "South Dakota": "46", "Tennessee": "47", "Texas": "48", "Utah": "49",
-                "Vermont": "50", "Virginia": "51", "Washington": "53", "West Virginia": "54",
-                "Wisconsin": "55", "Wyoming": "56", "District of Columbia": "11",
-                "Puerto Rico": "72"
-            }
-            
-            state_name = arguments.get("state_name")
-            if state_name:
-                # Case-insensitive lookup
-                for name, code in state_fips.items():
-                    if name.lower() == state_name.lower():
-                        return [TextContent(
-                            type="text",
-                            text=json.dumps({
-                                "state": name,
-                                "fips_code": code
-                            }, indent=2)
-                        )]
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "success": False,
-                        "error": f"State '{state_name}' not found"
-                    }, indent=2)
-                )]
-            else:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "state_fips_codes": state_fips
-                    }, indent=2)
-                )]
-        
-        else:
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "success": False,
-                    "error": f"Unknown tool: {name}"
-                }, indent=2)
-            )]
-    
+        return await handler(arguments)
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "success": False,
                 "error": f"Error executing tool: {str(e)}"
-            }, indent=2)
+            })
         )]
 
 
 async def main():
     """Main entry point for the Census MCP server."""
-    global census_client
+    load_dotenv()
     
     try:
         # Initialize Census API client
-        census_client = CensusAPIClient()
+        await census_client.get()
         
         # Run server
         async with stdio_server() as (read_stream, write_stream):
@@ -319,8 +330,7 @@ async def main():
             )
     finally:
         # Cleanup
-        if census_client:
-            await census_client.close()
+        await census_client.close()
 
 
 if __name__ == "__main__":
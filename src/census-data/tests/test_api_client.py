@@ -1,11 +1,27 @@
 """Tests for Census API client."""
 
+from contextlib import asynccontextmanager
+
+import httpx
+import orjson
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import MagicMock, patch
 from us_data_mcp.census_data.api_client import CensusAPIClient
 from us_data_mcp.census_data.models import CensusResponse
 
 
+def mock_stream(payload, status_code=200):
+    """Build a stand-in for AsyncClient.stream that serves a canned JSON body."""
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        yield httpx.Response(
+            status_code,
+            content=orjson.dumps(payload),
+            request=httpx.Request(method, url)
+        )
+    return stream
+
+
 @pytest.fixture
 def api_key():
     """Fixture for API key."""
@@ -73,12 +89,7 @@ class TestCensusAPIClient:
             ["California", "39538223", "06"]
         ]
         
-        with patch.object(census_client.client, "get") as mock_get:
-            mock_response = AsyncMock()
-            mock_response.json.return_value = mock_response_data
-            mock_response.raise_for_status = AsyncMock()
-            mock_get.return_value = mock_response
-            
+        with patch.object(census_client.client, "stream", mock_stream(mock_response_data)):
             result = await census_client.get_data(
                 year=2020,
                 dataset="acs/acs5",
@@ -91,6 +102,137 @@ class TestCensusAPIClient:
             assert result.data[0]["NAME"] == "California"
             assert result.data[0]["B01001_001E"] == "39538223"
     
+    @pytest.mark.asyncio
+    async def test_get_data_invalid_request(self, census_client):
+        """Test obviously invalid queries are rejected without an HTTP call."""
+        stream = MagicMock()
+        
+        with patch.object(census_client.client, "stream", stream):
+            for kwargs in (
+                {"year": 2020, "variables": []},
+                {"year": 1850, "variables": ["NAME"]},
+                {"year": 2020, "variables": ["NAME"], "state": "CA"},
+            ):
+                result = await census_client.get_data(
+                    dataset="acs/acs5",
+                    geography="state:*",
+                    **kwargs
+                )
+                assert result.success is False
+                assert result.error
+            
+            stream.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_data_rejects_non_ascii_state_digits(self, census_client):
+        """Test Unicode digits (e.g. Arabic-Indic) are not accepted as a state FIPS code."""
+        stream = MagicMock()
+        
+        with patch.object(census_client.client, "stream", stream):
+            result = await census_client.get_data(
+                dataset="acs/acs5",
+                variables=["NAME"],
+                geography="county:*",
+                year=2020,
+                state="٠٦"
+            )
+        
+        assert result.success is False
+        assert "2-digit FIPS" in result.error
+        stream.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_data_columnar(self, census_client):
+        """Test columnar data retrieval."""
+        mock_response_data = [
+            ["NAME", "B01001_001E", "state"],
+            ["California", "39538223", "06"],
+            ["Texas", "29145505", "48"]
+        ]
+        
+        with patch.object(census_client.client, "stream", mock_stream(mock_response_data)):
+            result = await census_client.get_data(
+                year=2020,
+                dataset="acs/acs5",
+                variables=["NAME", "B01001_001E"],
+                geography="state:*",
+                columnar=True
+            )
+            
+            assert result.success is True
+            assert result.metadata["count"] == 2
+            assert result.data == [{
+                "NAME": ["California", "Texas"],
+                "B01001_001E": ["39538223", "29145505"],
+                "state": ["06", "48"]
+            }]
+    
+    @pytest.mark.asyncio
+    async def test_get_data_retries_server_error(self, census_client):
+        """Test a transient 5xx is retried before giving up."""
+        mock_response_data = [
+            ["NAME", "B01001_001E", "state"],
+            ["California", "39538223", "06"]
+        ]
+        streams = iter([mock_stream(None, status_code=503), mock_stream(mock_response_data)])
+        stream = MagicMock(side_effect=lambda *args, **kwargs: next(streams)(*args, **kwargs))
+        
+        with patch.object(census_client.client, "stream", stream):
+            result = await census_client.get_data(
+                year=2020,
+                dataset="acs/acs5",
+                variables=["NAME", "B01001_001E"],
+                geography="state:*"
+            )
+            
+            assert result.success is True
+            assert stream.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_data_as_tuples(self, census_client):
+        """Test row tuple data retrieval."""
+        mock_response_data = [
+            ["NAME", "B01001_001E", "state"],
+            ["California", "39538223", "06"],
+            ["Texas", "29145505", "48"]
+        ]
+        
+        with patch.object(census_client.client, "stream", mock_stream(mock_response_data)):
+            result = await census_client.get_data(
+                year=2020,
+                dataset="acs/acs5",
+                variables=["NAME", "B01001_001E"],
+                geography="state:*",
+                as_tuples=True
+            )
+            
+            assert result.success is True
+            assert result.metadata["count"] == 2
+            assert result.data[1].NAME == "Texas"
+            assert result.data[0] == ("California", "39538223", "06")
+            assert '["Texas","29145505","48"]' in result.model_dump_json()
+    
+    @pytest.mark.asyncio
+    async def test_get_data_cached(self, census_client):
+        """Test repeated identical queries are served from the cache."""
+        mock_response_data = [
+            ["NAME", "B01001_001E", "state"],
+            ["California", "39538223", "06"]
+        ]
+        stream = MagicMock(side_effect=mock_stream(mock_response_data))
+        
+        with patch.object(census_client.client, "stream", stream):
+            for _ in range(2):
+                result = await census_client.get_data(
+                    year=2020,
+                    dataset="acs/acs5",
+                    variables=["NAME", "B01001_001E"],
+                    geography="state:*"
+                )
+                assert result.success is True
+        
+        assert stream.call_count == 1
+    
     @pytest.mark.asyncio
     async def test_get_population_data(self, census_client):
         """Test population data retrieval."""
@@ -99,12 +241,7 @@ class TestCensusAPIClient:
             ["California", "39538223", "36.5", "06"]
         ]
         
-        with patch.object(census_client.client, "get") as mock_get:
-            mock_response = AsyncMock()
-            mock_response.json.return_value = mock_response_data
-            mock_response.raise_for_status = AsyncMock()
-            mock_get.return_value = mock_response
-            
+        with patch.object(census_client.client, "stream", mock_stream(mock_response_data)):
             result = await census_client.get_population_data(
                 year=2020,
                 state="06"
@@ -122,12 +259,7 @@ class TestCensusAPIClient:
             ["California", "75235", "06"]
         ]
         
-        with patch.object(census_client.client, "get") as mock_get:
-            mock_response = AsyncMock()
-            mock_response.json.return_value = mock_response_data
-            mock_response.raise_for_status = AsyncMock()
-            mock_get.return_value = mock_response
-            
+        with patch.object(census_client.client, "stream", mock_stream(mock_response_data)):
             result = await census_client.get_economic_data(
                 year=2020,
                 state="06"
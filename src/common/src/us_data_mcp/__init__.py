@@ -0,0 +1,8 @@
+"""US Data MCP Servers - shared helpers."""
+
+from pkgutil import extend_path
+
+# Every server distribution ships a us_data_mcp package; merge them all
+__path__ = extend_path(__path__, __name__)
+
+__version__ = "0.1.0"
@@ -0,0 +1,6 @@
+"""Helpers shared by the US Data MCP servers."""
+
+from .clients import SharedClient
+from .streaming import AsyncByteStream
+
+__all__ = ["AsyncByteStream", "SharedClient"]
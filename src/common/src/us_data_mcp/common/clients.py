@@ -0,0 +1,38 @@
+"""Lazily created API clients shared across MCP tool calls."""
+
+import asyncio
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SharedClient(Generic[T]):
+    """Hold one API client per server, built on first use so its connection pool is reused.
+    
+    Args:
+        factory: Callable that constructs the client; it must provide an async ``close()``
+    """
+    
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._client: Optional[T] = None
+        self._lock = asyncio.Lock()
+    
+    async def get(self) -> T:
+        """Return the shared client, creating it on first use.
+        
+        Returns:
+            The shared client instance
+        """
+        if self._client is None:
+            # Re-check under the lock so concurrent first calls build a single client
+            async with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the shared client if it was created; a later get() builds a new one."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.close()
@@ -0,0 +1,19 @@
+"""Streaming helpers for incremental JSON parsing of HTTP responses."""
+
+from typing import AsyncIterator
+
+
+class AsyncByteStream:
+    """Adapt an async iterator of byte chunks to the async ``read()`` ijson expects."""
+    
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+    
+    async def read(self, size: int = -1) -> bytes:
+        if not self._buffer:
+            self._buffer = await anext(self._chunks, b"")
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
@@ -0,0 +1,54 @@
+"""Tests for the shared API client holder."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from us_data_mcp.common import SharedClient
+
+
+@pytest.fixture
+def factory():
+    """Fixture for a client factory that yields a fresh mock client per call."""
+    return MagicMock(side_effect=lambda: MagicMock(close=AsyncMock()))
+
+
+class TestSharedClient:
+    """Test cases for SharedClient."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_build_one_client(self, factory):
+        """Test concurrent first calls share a single client."""
+        shared = SharedClient(factory)
+        
+        clients = await asyncio.gather(*(shared.get() for _ in range(5)))
+        
+        assert factory.call_count == 1
+        assert all(client is clients[0] for client in clients)
+    
+    @pytest.mark.asyncio
+    async def test_close_resets_client(self, factory):
+        """Test close() closes the client and a later get() builds a new one."""
+        shared = SharedClient(factory)
+        first = await shared.get()
+        
+        await shared.close()
+        await shared.close()
+        second = await shared.get()
+        
+        first.close.assert_awaited_once()
+        assert second is not first
+        assert factory.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_close_without_client(self, factory):
+        """Test close() before first use does not build a client."""
+        shared = SharedClient(factory)
+        
+        await shared.close()
+        
+        factory.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
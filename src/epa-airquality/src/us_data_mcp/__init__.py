@@ -1,3 +1,9 @@
 """EPA Air Quality System (AQS) Data MCP Server."""
 
+from pkgutil import extend_path
+
+# Every server distribution ships a us_data_mcp package; merge them so the
+# shared us_data_mcp.common helpers resolve in any install layout
+__path__ = extend_path(__path__, __name__)
+
 __version__ = "0.1.0"
@@ -1,20 +1,28 @@
 """EPA AQS API client for accessing air quality data."""
 
 import os
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, List, Optional, Sequence
 import httpx
-from dotenv import load_dotenv
+import orjson
+from async_lru import alru_cache
 
 from .models import EPAResponse, COMMON_PARAMS
 
-# Load environment variables
-load_dotenv()
+
+_COUNTY_FIPS_RE = re.compile(r"[0-9]{3}")
+
+
+class _AQSError(Exception):
+    """Raised when AQS rejects a request or credentials are missing."""
 
 
 class EPAAQSClient:
     """Client for interacting with the EPA AQS (Air Quality System) API."""
     
     BASE_URL = "https://aqs.epa.gov/data/api"
+    DAILY_BY_STATE = "/dailyData/byState"
+    DAILY_BY_COUNTY = "/dailyData/byCounty"
     
     def __init__(self, email: Optional[str] = None, api_key: Optional[str] = None):
         """Initialize EPA AQS client.
@@ -25,10 +33,21 @@ class EPAAQSClient:
         """
         self.email = email or os.getenv("EPA_AQS_EMAIL")
         self.api_key = api_key or os.getenv("EPA_AQS_KEY")
-        self.client = httpx.AsyncClient(timeout=60.0)
+        # Credentials are the same on every request, so encode them once
+        self._base_params = httpx.QueryParams({"email": self.email or "", "key": self.api_key or ""})
+        self.client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+        )
+        
+        # Per-instance row cache; concurrent identical queries share one request
+        self._cached_fetch_daily = alru_cache(maxsize=1024, ttl=3600)(self._fetch_daily)
     
     async def close(self) -> None:
         """Close the HTTP client."""
+        self._cached_fetch_daily.cache_clear()
         await self.client.aclose()
     
     async def __aenter__(self):
@@ -49,6 +68,10 @@ class EPAAQSClient:
     ) -> EPAResponse:
         """Fetch daily summaries from EPA AQS API.
         
+        Successful results are cached per query for an hour and concurrent
+        identical queries share a single upstream request; cached rows are
+        shared between callers and should be treated as read-only.
+        
         Args:
             param_code: Parameter code
             bdate: Begin date (YYYYMMDD)
@@ -59,52 +82,180 @@ class EPAAQSClient:
         Returns:
             EPAResponse with data
         """
-        if not self.email or not self.api_key:
+        try:
+            results = await self._cached_fetch_daily(param_code, bdate, edate, state, county)
+        except Exception as e:
             return EPAResponse(
                 success=False,
-                error="EPA AQS email and API key are required. Sign up at https://aqs.epa.gov/data/api/signup"
+                error=str(e)
             )
+        
+        # Rows come straight from the API; skip re-validating each one
+        return EPAResponse.model_construct(
+            data=results,
+            metadata=self._daily_metadata(param_code, results),
+            success=True,
+            error=None
+        )
+    
+    async def get_daily_data_multi(
+        self,
+        param_code: str,
+        bdate: str,
+        edate: str,
+        state: str,
+        counties: Sequence[str]
+    ) -> EPAResponse:
+        """Fetch daily summaries for several counties of one state.
+        
+        Issues a single by-state request and keeps the rows for the requested
+        counties, instead of one by-county request per county. A single county
+        goes through the regular by-county query.
+        
+        Args:
+            param_code: Parameter code
+            bdate: Begin date (YYYYMMDD)
+            edate: End date (YYYYMMDD)
+            state: State FIPS code
+            counties: County FIPS codes
             
+        Returns:
+            EPAResponse with the rows for all requested counties, grouped by
+            county in request order; metadata["counties"] maps each county
+            to its row count
+        """
+        # Reject county codes AQS would refuse without a round-trip
+        invalid = [county for county in counties if not _COUNTY_FIPS_RE.fullmatch(county)]
+        error = None
+        if not counties:
+            error = "At least one county is required"
+        elif invalid:
+            error = f"Counties must be 3-digit FIPS codes, got {invalid!r}"
+        if error:
+            return EPAResponse(success=False, error=error)
+        
+        if len(counties) == 1:
+            response = await self.get_daily_data(param_code, bdate, edate, state, counties[0])
+            if response.success:
+                response.metadata["counties"] = {counties[0]: len(response.data)}
+            return response
+        
         try:
-            endpoint = "/dailyData/byCounty" if county else "/dailyData/byState"
-            params = {
-                "email": self.email,
-                "key": self.api_key,
-                "param": param_code,
-                "bdate": bdate,
-                "edate": edate,
-                "state": state
-            }
-            if county:
-                params["county"] = county
-                
-            response = await self.client.get(f"{self.BASE_URL}{endpoint}", params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get("Header", [{}])[0].get("status") != "Success":
-                return EPAResponse(
-                    success=False,
-                    error=data.get("Header", [{}])[0].get("error_msg", "Unknown AQS error")
-                )
-                
-            results = data.get("Data", [])
-            return EPAResponse(
-                data=results,
-                metadata={
-                    "param": param_code,
-                    "param_description": COMMON_PARAMS.get(param_code, "Unknown"),
-                    "count": len(results)
-                },
-                success=True
-            )
-            
+            results = await self._cached_fetch_daily(param_code, bdate, edate, state, None)
         except Exception as e:
             return EPAResponse(
                 success=False,
                 error=str(e)
             )
+        
+        by_county: Dict[str, List[Dict[str, Any]]] = {county: [] for county in counties}
+        for row in results:
+            rows = by_county.get(row.get("county_code"))
+            if rows is not None:
+                rows.append(row)
+        
+        data = [row for rows in by_county.values() for row in rows]
+        metadata = self._daily_metadata(param_code, data)
+        metadata["counties"] = {county: len(rows) for county, rows in by_county.items()}
+        return EPAResponse.model_construct(
+            data=data,
+            metadata=metadata,
+            success=True,
+            error=None
+        )
+    
+    async def get_daily_data_json(
+        self,
+        param_code: str,
+        bdate: str,
+        edate: str,
+        state: str,
+        county: Optional[str] = None,
+        pretty: bool = False
+    ) -> bytes:
+        """Fetch daily summaries and return them as serialized JSON.
+        
+        Produces the same document as ``get_daily_data().to_json()`` but
+        encodes the cached rows directly, without building an ``EPAResponse``
+        first.
+        
+        Args:
+            param_code: Parameter code
+            bdate: Begin date (YYYYMMDD)
+            edate: End date (YYYYMMDD)
+            state: State FIPS code
+            county: County FIPS code (optional)
+            pretty: Indent the output
+            
+        Returns:
+            UTF-8 encoded JSON bytes
+        """
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        try:
+            results = await self._cached_fetch_daily(param_code, bdate, edate, state, county)
+        except Exception as e:
+            return orjson.dumps(
+                {"data": [], "metadata": {}, "success": False, "error": str(e)},
+                option=option
+            )
+        
+        return orjson.dumps(
+            {
+                "data": results,
+                "metadata": self._daily_metadata(param_code, results),
+                "success": True,
+                "error": None
+            },
+            option=option
+        )
+    
+    async def _fetch_daily(
+        self,
+        param_code: str,
+        bdate: str,
+        edate: str,
+        state: str,
+        county: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Fetch daily summary rows, raising on HTTP or AQS errors so errors are never cached."""
+        if not self.email or not self.api_key:
+            raise _AQSError(
+                "EPA AQS email and API key are required. Sign up at https://aqs.epa.gov/data/api/signup"
+            )
+        
+        params = {
+            "param": param_code,
+            "bdate": bdate,
+            "edate": edate,
+            "state": state
+        }
+        if county:
+            params["county"] = county
+            endpoint = self.DAILY_BY_COUNTY
+        else:
+            endpoint = self.DAILY_BY_STATE
+            
+        response = await self.client.get(endpoint, params=self._base_params.merge(params))
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        
+        # Look the header up once; the fallback dict is only built for malformed responses
+        headers = data.get("Header")
+        header = headers[0] if headers else {}
+        if header.get("status") != "Success":
+            raise _AQSError(header.get("error_msg", "Unknown AQS error"))
+            
+        return data.get("Data", [])
+    
+    @staticmethod
+    def _daily_metadata(param_code: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the metadata envelope for a daily summary result."""
+        return {
+            "param": param_code,
+            "param_description": COMMON_PARAMS.get(param_code, "Unknown"),
+            "count": len(results)
+        }
 
     async def get_common_params(self) -> Dict[str, str]:
         """Return common AQS parameter codes."""
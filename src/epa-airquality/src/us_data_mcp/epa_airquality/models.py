@@ -1,6 +1,9 @@
 """Pydantic models for EPA AQS API requests and responses."""
 
+import hashlib
+import json
 from typing import Optional, List, Dict, Any
+import orjson
 from pydantic import BaseModel, Field
 
 
@@ -14,6 +17,16 @@ class AQSSearchRequest(BaseModel):
     county: Optional[str] = Field(None, description="County FIPS code (3 digits)")
 
 
+class AQSBatchSearchRequest(BaseModel):
+    """Request model for an EPA AQS search across several counties of one state."""
+    
+    param_code: str = Field(..., description="Parameter code (e.g., 44201 for Ozone, 88101 for PM2.5)")
+    bdate: str = Field(..., description="Begin date (YYYYMMDD)")
+    edate: str = Field(..., description="End date (YYYYMMDD)")
+    state: str = Field(..., description="State FIPS code (2 digits)")
+    counties: List[str] = Field(..., description="County FIPS codes (3 digits each)", min_length=1)
+
+
 class EPAResponse(BaseModel):
     """Response model for EPA data."""
     
@@ -21,6 +34,24 @@ class EPAResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Response metadata")
     success: bool = Field(default=True, description="Whether request was successful")
     error: Optional[str] = Field(None, description="Error message if request failed")
+    
+    def to_json(self, pretty: bool = False) -> bytes:
+        """Serialize to JSON bytes.
+        
+        The envelope fields are fixed, so they are handed to orjson as a plain
+        dict instead of having pydantic infer the type of every value in the
+        free-form ``data`` rows.
+        
+        Args:
+            pretty: Indent the output
+            
+        Returns:
+            UTF-8 encoded JSON bytes
+        """
+        return orjson.dumps(
+            {"data": self.data, "metadata": self.metadata, "success": self.success, "error": self.error},
+            option=orjson.OPT_INDENT_2 if pretty else 0
+        )
 
 
 # Common AQS Parameter Codes
@@ -34,3 +65,7 @@ COMMON_PARAMS = {
     "88502": "Acceptable PM2.5 AQI Specs",
     "14129": "Lead (TSP) LC"
 }
+
+# Content hash of COMMON_PARAMS, so callers can tell when a cached copy of
+# get_common_aqs_parameters output is stale
+PARAMS_VERSION = hashlib.sha256(json.dumps(COMMON_PARAMS, sort_keys=True).encode()).hexdigest()[:12]
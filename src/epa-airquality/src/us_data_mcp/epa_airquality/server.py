@@ -4,116 +4,194 @@ This server provides MCP tools for accessing EPA Air Quality System (AQS) data.
 """
 
 import asyncio
-import json
-from typing import Any, Optional
+import os
+from typing import Any
 
+import orjson
+from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from us_data_mcp.common import SharedClient
+
 from .api_client import EPAAQSClient
-from .models import AQSSearchRequest, COMMON_PARAMS
+from .models import AQSBatchSearchRequest, AQSSearchRequest, COMMON_PARAMS, PARAMS_VERSION
+
+
+# Compact JSON by default; set US_DATA_MCP_PRETTY=1 for indented output when debugging
+_INDENT = 2 if os.getenv("US_DATA_MCP_PRETTY") else None
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 if _INDENT else 0
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON text."""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
 
 
 # Initialize MCP server
 app = Server("us-data-mcp.epa-airquality")
 
 # Global API client
-epa_client: Optional[EPAAQSClient] = None
+epa_client = SharedClient(EPAAQSClient)
+
+# The parameter reference is static, so serialize it once at import
+_COMMON_PARAMS_RESPONSE = _dumps({"version": PARAMS_VERSION, "common_parameters": COMMON_PARAMS})
+
+# Tool definitions are static, so build them once at import
+_TOOLS = [
+    Tool(
+        name="get_daily_air_quality",
+        description=(
+            "Fetch daily air quality summary data from EPA AQS. "
+            "Requires parameter code, start date, end date, and state/county FIPS codes."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "param_code": {
+                    "type": "string",
+                    "description": "Parameter code (e.g., '44201' for Ozone, '88101' for PM2.5)"
+                },
+                "bdate": {
+                    "type": "string",
+                    "description": "Begin date (YYYYMMDD)"
+                },
+                "edate": {
+                    "type": "string",
+                    "description": "End date (YYYYMMDD)"
+                },
+                "state": {
+                    "type": "string",
+                    "description": "2-digit State FIPS code"
+                },
+                "county": {
+                    "type": "string",
+                    "description": "3-digit County FIPS code (optional)"
+                }
+            },
+            "required": ["param_code", "bdate", "edate", "state"]
+        }
+    ),
+    Tool(
+        name="get_daily_air_quality_batch",
+        description=(
+            "Fetch daily air quality summary data from EPA AQS for several counties "
+            "of one state in a single request. Rows are grouped by county."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "param_code": {
+                    "type": "string",
+                    "description": "Parameter code (e.g., '44201' for Ozone, '88101' for PM2.5)"
+                },
+                "bdate": {
+                    "type": "string",
+                    "description": "Begin date (YYYYMMDD)"
+                },
+                "edate": {
+                    "type": "string",
+                    "description": "End date (YYYYMMDD)"
+                },
+                "state": {
+                    "type": "string",
+                    "description": "2-digit State FIPS code"
+                },
+                "counties": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 1,
+                    "description": "3-digit County FIPS codes"
+                }
+            },
+            "required": ["param_code", "bdate", "edate", "state", "counties"]
+        }
+    ),
+    Tool(
+        name="get_common_aqs_parameters",
+        description=(
+            "Get a reference list of commonly used EPA AQS parameter codes "
+            "for air pollutants like Ozone, PM2.5, SO2, etc."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available MCP tools for EPA data access."""
-    return [
-        Tool(
-            name="get_daily_air_quality",
-            description=(
-                "Fetch daily air quality summary data from EPA AQS. "
-                "Requires parameter code, start date, end date, and state/county FIPS codes."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "param_code": {
-                        "type": "string",
-                        "description": "Parameter code (e.g., '44201' for Ozone, '88101' for PM2.5)"
-                    },
-                    "bdate": {
-                        "type": "string",
-                        "description": "Begin date (YYYYMMDD)"
-                    },
-                    "edate": {
-                        "type": "string",
-                        "description": "End date (YYYYMMDD)"
-                    },
-                    "state": {
-                        "type": "string",
-                        "description": "2-digit State FIPS code"
-                    },
-                    "county": {
-                        "type": "string",
-                        "description": "3-digit County FIPS code (optional)"
-                    }
-                },
-                "required": ["param_code", "bdate", "edate", "state"]
-            }
-        ),
-        Tool(
-            name="get_common_aqs_parameters",
-            description=(
-                "Get a reference list of commonly used EPA AQS parameter codes "
-                "for air pollutants like Ozone, PM2.5, SO2, etc."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        )
-    ]
+    return _TOOLS
+
+
+async def _daily_air_quality(arguments: Any) -> list[TextContent]:
+    """Handle the get_daily_air_quality tool."""
+    request = AQSSearchRequest.model_validate(arguments)
+    client = await epa_client.get()
+    payload = await client.get_daily_data_json(
+        param_code=request.param_code,
+        bdate=request.bdate,
+        edate=request.edate,
+        state=request.state,
+        county=request.county,
+        pretty=bool(_INDENT)
+    )
+    return [TextContent(type="text", text=payload.decode())]
+
+
+async def _daily_air_quality_batch(arguments: Any) -> list[TextContent]:
+    """Handle the get_daily_air_quality_batch tool."""
+    request = AQSBatchSearchRequest.model_validate(arguments)
+    client = await epa_client.get()
+    response = await client.get_daily_data_multi(
+        param_code=request.param_code,
+        bdate=request.bdate,
+        edate=request.edate,
+        state=request.state,
+        counties=request.counties
+    )
+    return [TextContent(type="text", text=response.to_json(pretty=bool(_INDENT)).decode())]
+
+
+async def _common_aqs_parameters(arguments: Any) -> list[TextContent]:
+    """Handle the get_common_aqs_parameters tool."""
+    return [TextContent(type="text", text=_COMMON_PARAMS_RESPONSE)]
+
+
+# Tool name -> handler
+_HANDLERS = {
+    "get_daily_air_quality": _daily_air_quality,
+    "get_daily_air_quality_batch": _daily_air_quality_batch,
+    "get_common_aqs_parameters": _common_aqs_parameters,
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls for EPA operations."""
-    global epa_client
-    
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=_dumps({"success": False, "error": f"Unknown tool: {name}"}))]
+        
     try:
-        if epa_client is None:
-            epa_client = EPAAQSClient()
-            
-        if name == "get_daily_air_quality":
-            request = AQSSearchRequest(**arguments)
-            response = await epa_client.get_daily_data(
-                param_code=request.param_code,
-                bdate=request.bdate,
-                edate=request.edate,
-                state=request.state,
-                county=request.county
-            )
-            return [TextContent(type="text", text=json.dumps(response.model_dump(), indent=2))]
-            
-        elif name == "get_common_aqs_parameters":
-            params = await epa_client.get_common_params()
-            return [TextContent(type="text", text=json.dumps({"common_parameters": params}, indent=2))]
-            
-        else:
-            return [TextContent(type="text", text=json.dumps({"success": False, "error": f"Unknown tool: {name}"}, indent=2))]
-            
+        return await handler(arguments)
     except Exception as e:
-        return [TextContent(type="text", text=json.dumps({"success": False, "error": str(e)}, indent=2))]
+        return [TextContent(type="text", text=_dumps({"success": False, "error": str(e)}))]
 
 
 async def main():
     """Main entry point for the EPA MCP server."""
-    global epa_client
+    load_dotenv()
     try:
-        epa_client = EPAAQSClient()
+        await epa_client.get()
         async with stdio_server() as (read_stream, write_stream):
             await app.run(read_stream, write_stream, app.create_initialization_options())
     finally:
-        if epa_client:
-            await epa_client.close()
+        await epa_client.close()
 
 
 if __name__ == "__main__":
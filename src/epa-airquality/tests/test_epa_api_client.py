@@ -0,0 +1,100 @@
+"""Tests for EPA AQS API client."""
+
+import httpx
+import orjson
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from us_data_mcp.epa_airquality.api_client import EPAAQSClient
+
+
+def mock_get(rows):
+    """Build a stand-in for AsyncClient.get that serves a successful AQS response."""
+    def respond(url, **kwargs):
+        return httpx.Response(
+            200,
+            content=orjson.dumps({"Header": [{"status": "Success"}], "Data": rows}),
+            request=httpx.Request("GET", f"{EPAAQSClient.BASE_URL}{url}")
+        )
+    return AsyncMock(side_effect=respond)
+
+
+def row(county, day):
+    """Build one daily summary row."""
+    return {"county_code": county, "date_local": day, "arithmetic_mean": 0.04}
+
+
+@pytest.fixture
+async def epa_client():
+    """Fixture for EPA AQS client."""
+    client = EPAAQSClient(email="test@example.com", api_key="test_key")
+    yield client
+    await client.close()
+
+
+class TestDailyDataMulti:
+    """Test cases for EPAAQSClient.get_daily_data_multi."""
+    
+    @pytest.mark.asyncio
+    async def test_splits_state_rows_by_county(self, epa_client):
+        """Test one by-state request is split into the requested counties, in request order."""
+        get = mock_get([
+            row("037", "2024-01-01"),
+            row("001", "2024-01-01"),
+            row("059", "2024-01-01"),
+            row("037", "2024-01-02"),
+        ])
+        
+        with patch.object(epa_client.client, "get", get):
+            result = await epa_client.get_daily_data_multi(
+                "44201", "20240101", "20240102", "06", ["059", "037", "073"]
+            )
+        
+        assert result.success is True
+        assert [(r["county_code"], r["date_local"]) for r in result.data] == [
+            ("059", "2024-01-01"),
+            ("037", "2024-01-01"),
+            ("037", "2024-01-02"),
+        ]
+        assert result.metadata["counties"] == {"059": 1, "037": 2, "073": 0}
+        assert result.metadata["count"] == 3
+        
+        get.assert_called_once()
+        endpoint = get.call_args.args[0]
+        assert endpoint == EPAAQSClient.DAILY_BY_STATE
+        assert "county" not in get.call_args.kwargs["params"]
+    
+    @pytest.mark.asyncio
+    async def test_single_county_uses_county_query(self, epa_client):
+        """Test a single county goes through the by-county query with the same metadata."""
+        get = mock_get([row("037", "2024-01-01"), row("037", "2024-01-02")])
+        
+        with patch.object(epa_client.client, "get", get):
+            result = await epa_client.get_daily_data_multi(
+                "44201", "20240101", "20240102", "06", ["037"]
+            )
+        
+        assert result.success is True
+        assert result.metadata["counties"] == {"037": 2}
+        assert result.metadata["param_description"] == "Ozone"
+        endpoint = get.call_args.args[0]
+        assert endpoint == EPAAQSClient.DAILY_BY_COUNTY
+        assert get.call_args.kwargs["params"]["county"] == "037"
+    
+    @pytest.mark.asyncio
+    async def test_invalid_counties_rejected(self, epa_client):
+        """Test malformed county codes are rejected without an HTTP call."""
+        get = MagicMock()
+        
+        with patch.object(epa_client.client, "get", get):
+            for counties in ([], ["37"], ["037", "abc"], ["0371"], ["٠٣٧"]):
+                result = await epa_client.get_daily_data_multi(
+                    "44201", "20240101", "20240102", "06", counties
+                )
+                assert result.success is False
+                assert result.error
+        
+        get.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,14 +1,19 @@
 """FDA openFDA API client for accessing drug information, recalls, and adverse events."""
 
-from typing import Dict, Any, List, Optional
-from urllib.parse import quote
+import asyncio
+from collections import OrderedDict
+from functools import partial
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 import httpx
-from dotenv import load_dotenv
+import ijson
+from async_lru import alru_cache
+
+from us_data_mcp.common import AsyncByteStream
 
 from .models import FDAResponse, RECALL_CLASSIFICATIONS
 
-# Load environment variables
-load_dotenv()
+# openFDA classification value ("Class II") -> description
+_CLASS_MAP = {f"Class {code}": description for code, description in RECALL_CLASSIFICATIONS.items()}
 
 
 class FDAAPIClient:
@@ -18,18 +23,52 @@ class FDAAPIClient:
     """
     
     BASE_URL = "https://api.fda.gov"
+    DRUGSFDA = "/drug/drugsfda.json"
+    DRUG_LABEL = "/drug/label.json"
+    DRUG_EVENT = "/drug/event.json"
+    DEVICE_510K = "/device/510k.json"
+    RECALL_CATEGORIES = ("drug", "food", "device")
+    # Drug names per OR-joined adverse-event query, keeping URLs well under openFDA's limit
+    BULK_CHUNK_SIZE = 20
+    # Most buckets a count query returns
+    COUNT_LIMIT = 1000
+    # Last good results kept to serve when openFDA times out or returns a 5xx
+    LAST_GOOD_SIZE = 1024
+    ENFORCEMENT = {category: f"/{category}/enforcement.json" for category in RECALL_CATEGORIES}
     
     def __init__(self):
         """Initialize FDA API client."""
+        # All requests go to one host, so keep connections alive and multiplex over HTTP/2
         self.client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            http2=True,
             timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0),
             headers={
                 "User-Agent": "US-Data-MCP-FDA-Server/0.1.0"
             }
         )
+        
+        # Per-endpoint result caches: approvals and labels change rarely,
+        # recalls more often, adverse event reports constantly; concurrent
+        # identical queries share one request
+        self._fetch_long = alru_cache(maxsize=512, ttl=3600)(self._fetch)
+        self._fetch_normal = alru_cache(maxsize=512, ttl=600)(self._fetch)
+        self._fetch_short = alru_cache(maxsize=512, ttl=60)(self._fetch)
+        
+        # (endpoint, search, limit) -> last successful cached fetch, oldest first
+        self._last_good: "OrderedDict[Tuple[str, str, int], List[Dict[str, Any]]]" = OrderedDict()
+        
+        # Uncached endpoints still share one request between concurrent
+        # identical queries: (endpoint, search, limit, count) -> pending fetch
+        self._inflight: Dict[Tuple[str, str, int, Optional[str]], "asyncio.Future[List[Dict[str, Any]]]"] = {}
     
     async def close(self) -> None:
         """Close the HTTP client."""
+        self._fetch_long.cache_clear()
+        self._fetch_normal.cache_clear()
+        self._fetch_short.cache_clear()
+        self._last_good.clear()
         await self.client.aclose()
     
     async def __aenter__(self):
@@ -40,23 +79,120 @@ class FDAAPIClient:
         """Async context manager exit."""
         await self.close()
     
-    def _build_search_query(self, **kwargs) -> str:
+    async def _fetch(
+        self,
+        endpoint: str,
+        search: str,
+        limit: int,
+        count: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch the results array for one query, raising on failure so errors are never cached."""
+        params: Dict[str, Any] = {}
+        if search:
+            params["search"] = search
+        if count:
+            # Count queries return {term, count} buckets and allow up to COUNT_LIMIT
+            params["count"] = count
+            params["limit"] = min(limit, self.COUNT_LIMIT)
+        else:
+            params["limit"] = min(limit, 100)
+        
+        async with self.client.stream("GET", endpoint, params=params) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            
+            # Adverse-event and label documents run to megabytes; decode the
+            # results array item by item as the body arrives instead of
+            # buffering the raw bytes alongside the parsed objects
+            return [
+                item
+                async for item in ijson.items_async(
+                    AsyncByteStream(response.aiter_bytes()), "results.item", use_float=True
+                )
+            ]
+    
+    async def _fetch_or_stale(
+        self,
+        fetch: Callable[[str, str, int], Awaitable[List[Dict[str, Any]]]],
+        endpoint: str,
+        search: str,
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch through a TTL cache, falling back to the last good result during an outage.
+        
+        Args:
+            fetch: One of the cached fetchers (_fetch_long, _fetch_normal, _fetch_short)
+            endpoint: API endpoint path
+            search: Search query
+            limit: Maximum results
+            
+        Returns:
+            The results, and whether they are a stale copy served after a timeout or 5xx
+        """
+        key = (endpoint, search, limit)
+        try:
+            results = await fetch(endpoint, search, limit)
+        except (httpx.TimeoutException, httpx.HTTPStatusError) as e:
+            stale = self._last_good.get(key)
+            if stale is None or (isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500):
+                raise
+            return stale, True
+        
+        self._last_good[key] = results
+        self._last_good.move_to_end(key)
+        if len(self._last_good) > self.LAST_GOOD_SIZE:
+            self._last_good.popitem(last=False)
+        return results, False
+    
+    async def _fetch_shared(
+        self,
+        endpoint: str,
+        search: str,
+        limit: int,
+        count: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch without caching, joining an identical request already in flight."""
+        key = (endpoint, search, limit, count)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(endpoint, search, limit, count))
+            self._inflight[key] = future
+            future.add_done_callback(partial(self._settle_inflight, key))
+        # Shield so one caller giving up does not cancel the fetch for the others
+        return await asyncio.shield(future)
+    
+    def _settle_inflight(self, key: Tuple[str, str, int, Optional[str]], future: "asyncio.Future[Any]") -> None:
+        """Forget a finished shared fetch and retrieve its exception.
+        
+        If every waiter was cancelled nobody awaits the fetch, and asyncio
+        would otherwise log its failure as never retrieved.
+        """
+        self._inflight.pop(key, None)
+        if not future.cancelled():
+            future.exception()
+    
+    def _build_search_query(self, **kwargs: Optional[str]) -> str:
         """Build search query string from parameters.
         
+        The query is returned unencoded; httpx percent-encodes it once when it
+        is passed as the ``search`` parameter.
+        
         Args:
             **kwargs: Search parameters
             
         Returns:
-            URL-encoded search query
+            openFDA search expression
         """
-        conditions = []
-        for key, value in kwargs.items():
-            if value:
-                # Escape special characters and build condition
-                escaped_value = quote(str(value))
-                conditions.append(f"{key}:{escaped_value}")
-        
-        return "+AND+".join(conditions) if conditions else ""
+        search_term = self._search_term
+        return " AND ".join([search_term(key, value) for key, value in kwargs.items() if value])
+    
+    @staticmethod
+    def _search_term(key: str, value: str) -> str:
+        """Build one ``field:value`` term, quoting multi-word values as a phrase."""
+        if " " in value:
+            return f'{key}:"{value}"'
+        return f"{key}:{value}"
     
     async def search_drugs(
         self,
@@ -67,6 +203,9 @@ class FDAAPIClient:
     ) -> FDAResponse:
         """Search for drug information.
         
+        Results are cached per query for an hour and shared between callers,
+        so they should be treated as read-only.
+        
         Args:
             brand_name: Brand/trade name
             generic_name: Generic/chemical name
@@ -96,40 +235,29 @@ class FDAAPIClient:
             
             search_query = self._build_search_query(**search_params)
             
-            url = f"{self.BASE_URL}/drug/drugsfda.json"
-            params = {
-                "search": search_query,
-                "limit": min(limit, 100)
-            }
-            
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = data.get("results", [])
+            results, stale = await self._fetch_or_stale(self._fetch_long, self.DRUGSFDA, search_query, limit)
             
-            return FDAResponse(
-                data=results,
-                metadata={
-                    "query": search_params,
-                    "count": len(results),
-                    "source": "drug/drugsfda"
-                },
-                success=True
-            )
+            metadata = {
+                "query": search_params,
+                "count": len(results),
+                "source": "drug/drugsfda"
+            }
+            if stale:
+                metadata["stale"] = True
+            return FDAResponse.model_construct(data=results, metadata=metadata, success=True)
         
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
             return FDAResponse(
                 data=[],
-                metadata={"query": locals()},
+                metadata={"query": search_params},
                 success=False,
                 error=error_msg
             )
         except Exception as e:
             return FDAResponse(
                 data=[],
-                metadata={"query": locals()},
+                metadata={"query": search_params},
                 success=False,
                 error=str(e)
             )
@@ -142,6 +270,9 @@ class FDAAPIClient:
     ) -> FDAResponse:
         """Search drug labeling information.
         
+        Results are cached per query for an hour and shared between callers,
+        so they should be treated as read-only.
+        
         Args:
             brand_name: Brand name
             generic_name: Generic name
@@ -167,32 +298,21 @@ class FDAAPIClient:
             
             search_query = self._build_search_query(**search_params)
             
-            url = f"{self.BASE_URL}/drug/label.json"
-            params = {
-                "search": search_query,
-                "limit": min(limit, 100)
-            }
-            
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
+            results, stale = await self._fetch_or_stale(self._fetch_long, self.DRUG_LABEL, search_query, limit)
             
-            data = response.json()
-            results = data.get("results", [])
-            
-            return FDAResponse(
-                data=results,
-                metadata={
-                    "query": search_params,
-                    "count": len(results),
-                    "source": "drug/label"
-                },
-                success=True
-            )
+            metadata = {
+                "query": search_params,
+                "count": len(results),
+                "source": "drug/label"
+            }
+            if stale:
+                metadata["stale"] = True
+            return FDAResponse.model_construct(data=results, metadata=metadata, success=True)
         
         except Exception as e:
             return FDAResponse(
                 data=[],
-                metadata={"query": locals()},
+                metadata={"query": search_params},
                 success=False,
                 error=str(e)
             )
@@ -206,6 +326,9 @@ class FDAAPIClient:
     ) -> FDAResponse:
         """Search drug recalls.
         
+        Results are cached per query for ten minutes and shared between
+        callers, so they should be treated as read-only.
+        
         Args:
             product_description: Product description
             classification: Recall classification (I, II, III)
@@ -220,48 +343,34 @@ class FDAAPIClient:
             if product_description:
                 search_params["product_description"] = product_description
             if classification:
-                search_params["classification"] = f"Class+{classification}"
+                search_params["classification"] = f"Class {classification}"
             if status:
                 search_params["status"] = status
             
             search_query = self._build_search_query(**search_params)
             
-            url = f"{self.BASE_URL}/drug/enforcement.json"
-            params = {}
-            if search_query:
-                params["search"] = search_query
-            params["limit"] = min(limit, 100)
-            
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = data.get("results", [])
+            results, stale = await self._fetch_or_stale(self._fetch_normal, self.ENFORCEMENT["drug"], search_query, limit)
             
             # Add classification descriptions
+            describe = _CLASS_MAP.get
             for result in results:
-                class_str = result.get("classification", "")
-                if "Class I" in class_str:
-                    result["classification_description"] = RECALL_CLASSIFICATIONS["I"]
-                elif "Class II" in class_str:
-                    result["classification_description"] = RECALL_CLASSIFICATIONS["II"]
-                elif "Class III" in class_str:
-                    result["classification_description"] = RECALL_CLASSIFICATIONS["III"]
+                description = describe(result.get("classification", "").strip())
+                if description:
+                    result["classification_description"] = description
             
-            return FDAResponse(
-                data=results,
-                metadata={
-                    "query": search_params,
-                    "count": len(results),
-                    "source": "drug/enforcement"
-                },
-                success=True
-            )
+            metadata = {
+                "query": search_params,
+                "count": len(results),
+                "source": "drug/enforcement"
+            }
+            if stale:
+                metadata["stale"] = True
+            return FDAResponse.model_construct(data=results, metadata=metadata, success=True)
         
         except Exception as e:
             return FDAResponse(
                 data=[],
-                metadata={"query": locals()},
+                metadata={"query": search_params},
                 success=False,
                 error=str(e)
             )
@@ -274,6 +383,9 @@ class FDAAPIClient:
     ) -> FDAResponse:
         """Search adverse event reports.
         
+        Results are cached per query for a minute and shared between callers,
+        so they should be treated as read-only.
+        
         Args:
             drug_name: Drug name
             reaction: Specific adverse reaction (optional)
@@ -292,29 +404,18 @@ class FDAAPIClient:
             
             search_query = self._build_search_query(**search_params)
             
-            url = f"{self.BASE_URL}/drug/event.json"
-            params = {
-                "search": search_query,
-                "limit": min(limit, 100)
-            }
-            
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = data.get("results", [])
+            results, stale = await self._fetch_or_stale(self._fetch_short, self.DRUG_EVENT, search_query, limit)
             
-            return FDAResponse(
-                data=results,
-                metadata={
-                    "drug_name": drug_name,
-                    "reaction": reaction,
-                    "count": len(results),
-                    "source": "drug/event",
-                    "note": "Data may include consumer and healthcare professional reports"
-                },
-                success=True
-            )
+            metadata = {
+                "drug_name": drug_name,
+                "reaction": reaction,
+                "count": len(results),
+                "source": "drug/event",
+                "note": "Data may include consumer and healthcare professional reports"
+            }
+            if stale:
+                metadata["stale"] = True
+            return FDAResponse.model_construct(data=results, metadata=metadata, success=True)
         
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -339,6 +440,122 @@ class FDAAPIClient:
                 error=str(e)
             )
 
+    async def search_adverse_events_bulk(self, drug_names: List[str]) -> FDAResponse:
+        """Count adverse event reports for several drugs with one request per chunk.
+        
+        Drug names are OR-joined into a single search and the reports are
+        counted per brand name, so N drugs cost one round trip (or one per
+        BULK_CHUNK_SIZE names, fetched concurrently) instead of N. When a
+        chunk fills all COUNT_LIMIT buckets, requested drugs missing from
+        them may have been outranked by co-reported drugs and are counted
+        individually.
+        
+        Args:
+            drug_names: Drug brand names
+            
+        Returns:
+            FDAResponse with one {drug_name, count} row per requested drug
+        """
+        names = [name.strip() for name in drug_names]
+        if not all(names):
+            return FDAResponse(
+                data=[],
+                metadata={"drug_names": drug_names},
+                success=False,
+                error="Drug names must not be empty"
+            )
+        
+        field = "patient.drug.openfda.brand_name"
+        chunks = [
+            names[i:i + self.BULK_CHUNK_SIZE]
+            for i in range(0, len(names), self.BULK_CHUNK_SIZE)
+        ]
+        
+        results = await asyncio.gather(
+            *(
+                self._fetch_shared(
+                    self.DRUG_EVENT,
+                    " OR ".join(self._search_term(field, name) for name in chunk),
+                    self.COUNT_LIMIT,
+                    count=f"{field}.exact"
+                )
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        
+        # Buckets are keyed by the exact (upper-case) brand name and include
+        # co-reported drugs. Only a chunk's own names are taken from its
+        # buckets: a co-reported count covers just the reports that chunk matched
+        counts: Dict[str, int] = {}
+        truncated: List[str] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, httpx.HTTPStatusError) and result.response.status_code == 404:
+                continue  # No reports for any drug in this chunk
+            if isinstance(result, BaseException):
+                return FDAResponse(
+                    data=[],
+                    metadata={"drug_names": drug_names},
+                    success=False,
+                    error=str(result)
+                )
+            buckets = {bucket["term"].upper(): bucket["count"] for bucket in result}
+            for name in chunk:
+                key = name.upper()
+                if key in buckets:
+                    counts[key] = buckets[key]
+                elif len(result) >= self.COUNT_LIMIT:
+                    truncated.append(name)
+        
+        recounts = await asyncio.gather(
+            *(self._count_adverse_events(field, name) for name in truncated),
+            return_exceptions=True,
+        )
+        for name, result in zip(truncated, recounts):
+            if isinstance(result, BaseException):
+                return FDAResponse(
+                    data=[],
+                    metadata={"drug_names": drug_names},
+                    success=False,
+                    error=str(result)
+                )
+            counts[name.upper()] = result
+        
+        data = [
+            {"drug_name": name, "count": counts.get(key.upper(), 0)}
+            for name, key in zip(drug_names, names)
+        ]
+        return FDAResponse.model_construct(
+            data=data,
+            metadata={
+                "drug_names": drug_names,
+                "requests": len(chunks) + len(truncated),
+                "source": "drug/event",
+                "note": "Counts are reports listing the drug; a report may list several drugs"
+            },
+            success=True
+        )
+    
+    async def _count_adverse_events(self, field: str, name: str) -> int:
+        """Count reports listing one exact brand name.
+        
+        Every report matched by the exact search lists the drug, so its own
+        bucket carries the full count.
+        """
+        key = name.upper()
+        try:
+            buckets = await self._fetch_shared(
+                self.DRUG_EVENT,
+                f'{field}.exact:"{key}"',
+                self.COUNT_LIMIT,
+                count=f"{field}.exact"
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return 0
+            raise
+        return next((bucket["count"] for bucket in buckets if bucket["term"].upper() == key), 0)
+    
     async def search_devices(self, device_name: str, limit: int = 10) -> FDAResponse:
         """Search for medical devices.
         
@@ -350,39 +567,69 @@ class FDAAPIClient:
             FDAResponse with medical device information
         """
         try:
-            url = f"{self.BASE_URL}/device/510k.json"
-            params = {
-                "search": f"device_name:{quote(device_name)}",
-                "limit": min(limit, 100)
-            }
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return FDAResponse(data=data.get("results", []), success=True)
+            results = await self._fetch_shared(self.DEVICE_510K, self._search_term("device_name", device_name), limit)
+            return FDAResponse.model_construct(data=results, success=True)
         except Exception as e:
             return FDAResponse(data=[], success=False, error=str(e))
 
     async def search_all_recalls(self, category: str, product_description: Optional[str] = None, limit: int = 10) -> FDAResponse:
         """Search all FDA recalls (drug, food, or device).
         
+        With category "all" the drug, food and device enforcement endpoints are
+        queried concurrently and their results merged; a category that fails
+        (e.g. no matches) is reported in metadata without failing the others.
+        Each category's results are cached for ten minutes, like search_recalls.
+        
         Args:
-            category: drug, food, or device
+            category: drug, food, device, or all
             product_description: Product name/description
-            limit: Max results
+            limit: Max results per category
             
         Returns:
             FDAResponse with recall information
         """
-        try:
-            url = f"{self.BASE_URL}/{category}/enforcement.json"
-            search_query = f"product_description:{quote(product_description)}" if product_description else ""
-            params = {"limit": min(limit, 100)}
-            if search_query:
-                params["search"] = search_query
-                
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return FDAResponse(data=data.get("results", []), success=True)
-        except Exception as e:
-            return FDAResponse(data=[], success=False, error=str(e))
+        if category != "all" and category not in self.ENFORCEMENT:
+            return FDAResponse(
+                data=[],
+                success=False,
+                error=f"Unknown category: {category}. Use drug, food, device, or all"
+            )
+        
+        search_query = self._build_search_query(product_description=product_description)
+        categories = self.RECALL_CATEGORIES if category == "all" else (category,)
+        
+        results = await asyncio.gather(
+            *(
+                self._fetch_or_stale(self._fetch_normal, self.ENFORCEMENT[name], search_query, limit)
+                for name in categories
+            ),
+            return_exceptions=True,
+        )
+        
+        data: List[Dict[str, Any]] = []
+        counts: Dict[str, int] = {}
+        errors: Dict[str, str] = {}
+        stale = False
+        for name, result in zip(categories, results):
+            if isinstance(result, BaseException):
+                errors[name] = str(result)
+            else:
+                rows, category_stale = result
+                data.extend(rows)
+                counts[name] = len(rows)
+                stale = stale or category_stale
+        
+        if not counts:
+            # A single category keeps its bare error; several are labelled by category
+            if len(errors) == 1:
+                error = next(iter(errors.values()))
+            else:
+                error = "; ".join(f"{name}: {msg}" for name, msg in errors.items())
+            return FDAResponse(data=[], success=False, error=error)
+        
+        metadata: Dict[str, Any] = {}
+        if len(categories) > 1:
+            metadata = {"counts": counts, "errors": errors}
+        if stale:
+            metadata["stale"] = True
+        return FDAResponse.model_construct(data=data, metadata=metadata, success=True)
@@ -30,6 +30,12 @@ class AdverseEventRequest(BaseModel):
     limit: int = Field(default=10, description="Maximum number of results", ge=1, le=100)
 
 
+class AdverseEventBulkRequest(BaseModel):
+    """Request model for adverse event report counts across several drugs."""
+    
+    drug_names: List[str] = Field(..., description="Drug brand names", min_length=1, max_length=100)
+
+
 class DeviceSearchRequest(BaseModel):
     """Request model for medical device search."""
     
@@ -40,7 +46,7 @@ class DeviceSearchRequest(BaseModel):
 class AllRecallSearchRequest(BaseModel):
     """Request model for all FDA recalls (food, drug, device)."""
     
-    category: str = Field(..., description="Category: drug, food, or device")
+    category: str = Field(..., description="Category: drug, food, device, or all")
     product_description: Optional[str] = Field(None, description="Product description")
     limit: int = Field(default=10, description="Max results", ge=1, le=100)
 
@@ -0,0 +1,332 @@
+"""Tests for FDA API client."""
+
+import asyncio
+import gc
+from contextlib import asynccontextmanager
+
+import httpx
+import orjson
+import pytest
+from unittest.mock import MagicMock, patch
+from us_data_mcp.fda_drugs.api_client import FDAAPIClient
+
+
+BRAND = "patient.drug.openfda.brand_name"
+
+
+def mock_stream(handler):
+    """Build a stand-in for AsyncClient.stream that routes each request to handler.
+    
+    handler receives the query params and returns (status_code, results).
+    """
+    @asynccontextmanager
+    async def stream(method, url, params=None, **kwargs):
+        status_code, results = handler(params or {})
+        yield httpx.Response(
+            status_code,
+            content=orjson.dumps({"results": results}),
+            request=httpx.Request(method, f"{FDAAPIClient.BASE_URL}{url}", params=params)
+        )
+    return stream
+
+
+def buckets(**counts):
+    """Build count-query buckets from term=count pairs."""
+    return [{"term": term, "count": count} for term, count in counts.items()]
+
+
+@pytest.fixture
+async def fda_client():
+    """Fixture for FDA API client."""
+    client = FDAAPIClient()
+    yield client
+    await client.close()
+
+
+class TestAdverseEventsBulk:
+    """Test cases for FDAAPIClient.search_adverse_events_bulk."""
+    
+    @pytest.mark.asyncio
+    async def test_counts_requested_drugs_only(self, fda_client):
+        """Test co-reported drugs are dropped and names match case-insensitively."""
+        stream = MagicMock(side_effect=mock_stream(
+            lambda params: (200, buckets(ADVIL=120, ASPIRIN=80, TYLENOL=45))
+        ))
+        
+        with patch.object(fda_client.client, "stream", stream):
+            result = await fda_client.search_adverse_events_bulk(["Advil", "tylenol", "Motrin"])
+        
+        assert result.success is True
+        assert result.data == [
+            {"drug_name": "Advil", "count": 120},
+            {"drug_name": "tylenol", "count": 45},
+            {"drug_name": "Motrin", "count": 0},
+        ]
+        assert stream.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_recounts_drugs_cut_off_by_bucket_limit(self, fda_client):
+        """Test a drug missing from a full page of buckets is counted on its own."""
+        full_page = [{"term": f"DRUG {i}", "count": 5000 - i} for i in range(FDAAPIClient.COUNT_LIMIT)]
+        full_page[0] = {"term": "ADVIL", "count": 9000}
+        
+        def handler(params):
+            if params["search"] == f'{BRAND}.exact:"MOTRIN"':
+                return 200, buckets(MOTRIN=3, ADVIL=3)
+            return 200, full_page
+        
+        stream = MagicMock(side_effect=mock_stream(handler))
+        with patch.object(fda_client.client, "stream", stream):
+            result = await fda_client.search_adverse_events_bulk(["Advil", "Motrin"])
+        
+        assert result.success is True
+        assert result.data == [
+            {"drug_name": "Advil", "count": 9000},
+            {"drug_name": "Motrin", "count": 3},
+        ]
+        assert result.metadata["requests"] == 2
+        assert stream.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_co_reported_counts_do_not_leak_across_chunks(self, fda_client):
+        """Test a drug's count comes from its own chunk, not another chunk's buckets."""
+        names = ["Advil"] + [f"Drug{i}" for i in range(FDAAPIClient.BULK_CHUNK_SIZE)]
+        
+        def handler(params):
+            if "Advil" in params["search"]:
+                return 200, buckets(ADVIL=50)
+            # The second chunk also sees Advil as a co-reported drug on a few reports
+            return 200, buckets(DRUG19=10, ADVIL=2)
+        
+        with patch.object(fda_client.client, "stream", mock_stream(handler)):
+            result = await fda_client.search_adverse_events_bulk(names)
+        
+        assert result.success is True
+        assert result.data[0] == {"drug_name": "Advil", "count": 50}
+        assert result.data[-1] == {"drug_name": "Drug19", "count": 10}
+    
+    @pytest.mark.asyncio
+    async def test_chunk_without_reports(self, fda_client):
+        """Test a 404 (no matching reports) counts every drug in the chunk as zero."""
+        with patch.object(fda_client.client, "stream", mock_stream(lambda params: (404, []))):
+            result = await fda_client.search_adverse_events_bulk(["Nothing"])
+        
+        assert result.success is True
+        assert result.data == [{"drug_name": "Nothing", "count": 0}]
+    
+    @pytest.mark.asyncio
+    async def test_blank_names_rejected(self, fda_client):
+        """Test empty or blank names are rejected without an HTTP call."""
+        stream = MagicMock()
+        
+        with patch.object(fda_client.client, "stream", stream):
+            for names in (["Advil", ""], ["  "]):
+                result = await fda_client.search_adverse_events_bulk(names)
+                assert result.success is False
+                assert result.error
+        
+        stream.assert_not_called()
+
+
+class TestSharedFetch:
+    """Test cases for FDAAPIClient._fetch_shared request sharing."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_request(self, fda_client):
+        """Test two identical in-flight queries are served by one HTTP request."""
+        stream = MagicMock(side_effect=mock_stream(
+            lambda params: (200, [{"device_name": "PACEMAKER"}])
+        ))
+        
+        with patch.object(fda_client.client, "stream", stream):
+            first, second = await asyncio.gather(
+                fda_client.search_devices("pacemaker"),
+                fda_client.search_devices("pacemaker"),
+            )
+        
+        assert first.data == second.data == [{"device_name": "PACEMAKER"}]
+        assert stream.call_count == 1
+        assert fda_client._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_failure_after_all_waiters_cancel_is_retrieved(self, fda_client):
+        """Test a shared fetch failing after its only caller was cancelled is not logged."""
+        release = asyncio.Event()
+        
+        @asynccontextmanager
+        async def stream(method, url, **kwargs):
+            await release.wait()
+            yield httpx.Response(500, request=httpx.Request(method, f"{FDAAPIClient.BASE_URL}{url}"))
+        
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+        try:
+            with patch.object(fda_client.client, "stream", stream):
+                caller = asyncio.ensure_future(fda_client.search_devices("pacemaker"))
+                await asyncio.sleep(0)
+                (fetch,) = fda_client._inflight.values()
+                caller.cancel()
+                await asyncio.sleep(0)
+                assert caller.cancelled()
+                release.set()
+                # Wait for the fetch to fail without retrieving its exception
+                await asyncio.wait([fetch])
+            
+            del caller, fetch
+            gc.collect()
+            await asyncio.sleep(0)
+        finally:
+            loop.set_exception_handler(None)
+        
+        assert unhandled == []
+        assert fda_client._inflight == {}
+
+
+class TestAllRecalls:
+    """Test cases for FDAAPIClient.search_all_recalls."""
+    
+    @pytest.mark.asyncio
+    async def test_unknown_category_rejected(self, fda_client):
+        """Test an unknown category is rejected without an HTTP call."""
+        stream = MagicMock()
+        
+        with patch.object(fda_client.client, "stream", stream):
+            result = await fda_client.search_all_recalls("cosmetics")
+        
+        assert result.success is False
+        assert "cosmetics" in result.error
+        stream.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_all_merges_categories(self, fda_client):
+        """Test "all" queries every category concurrently and merges their results."""
+        requested = []
+        
+        @asynccontextmanager
+        async def stream(method, url, params=None, **kwargs):
+            requested.append(url)
+            category = url.split("/")[1]
+            status_code = 404 if category == "device" else 200
+            yield httpx.Response(
+                status_code,
+                content=orjson.dumps({"results": [{"category": category, "n": 1}, {"category": category, "n": 2}]}),
+                request=httpx.Request(method, f"{FDAAPIClient.BASE_URL}{url}", params=params)
+            )
+        
+        with patch.object(fda_client.client, "stream", stream):
+            result = await fda_client.search_all_recalls("all", product_description="peanut butter")
+        
+        assert sorted(requested) == sorted(FDAAPIClient.ENFORCEMENT.values())
+        assert result.success is True
+        assert [(r["category"], r["n"]) for r in result.data] == [
+            ("drug", 1), ("drug", 2), ("food", 1), ("food", 2)
+        ]
+        assert result.metadata["counts"] == {"drug": 2, "food": 2}
+        assert list(result.metadata["errors"]) == ["device"]
+    
+    @pytest.mark.asyncio
+    async def test_all_categories_failing_labels_each_error(self, fda_client):
+        """Test the error names each category when every category fails."""
+        with patch.object(fda_client.client, "stream", mock_stream(lambda params: (404, []))):
+            result = await fda_client.search_all_recalls("all")
+            single = await fda_client.search_all_recalls("food")
+        
+        assert result.success is False
+        assert [part.split(":")[0] for part in result.error.split("; ")] == ["drug", "food", "device"]
+        assert single.success is False
+        assert not single.error.startswith("food:")
+
+
+class TestCaching:
+    """Test cases for the per-endpoint caches and the stale fallback."""
+    
+    @pytest.mark.asyncio
+    async def test_adverse_events_cached(self, fda_client):
+        """Test repeated adverse event searches are served from the short-lived cache."""
+        stream = MagicMock(side_effect=mock_stream(lambda params: (200, [{"safetyreportid": "1"}])))
+        
+        with patch.object(fda_client.client, "stream", stream):
+            first = await fda_client.search_adverse_events("Advil")
+            second = await fda_client.search_adverse_events("Advil")
+        
+        assert first.data == second.data == [{"safetyreportid": "1"}]
+        assert stream.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_single_category_recalls_share_recall_cache(self, fda_client):
+        """Test a drug-only search_all_recalls reuses search_recalls' cached result."""
+        stream = MagicMock(side_effect=mock_stream(lambda params: (200, [{"recall_number": "D-1"}])))
+        
+        with patch.object(fda_client.client, "stream", stream):
+            await fda_client.search_recalls(product_description="aspirin")
+            result = await fda_client.search_all_recalls("drug", product_description="aspirin")
+        
+        assert result.success is True
+        assert result.data[0]["recall_number"] == "D-1"
+        assert stream.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_server_error_serves_stale(self, fda_client):
+        """Test a 5xx after the cache entry expires returns the last good result."""
+        outcomes = iter([(200, [{"recall_number": "D-1"}]), (503, [])])
+        
+        with patch.object(fda_client.client, "stream", mock_stream(lambda params: next(outcomes))):
+            fresh = await fda_client.search_recalls(product_description="aspirin")
+            fda_client._fetch_normal.cache_clear()
+            stale = await fda_client.search_recalls(product_description="aspirin")
+        
+        assert "stale" not in fresh.metadata
+        assert stale.success is True
+        assert stale.data == fresh.data
+        assert stale.metadata["stale"] is True
+    
+    @pytest.mark.asyncio
+    async def test_timeout_serves_stale(self, fda_client):
+        """Test a timeout after the cache entry expires returns the last good result."""
+        calls = []
+        
+        @asynccontextmanager
+        async def stream(method, url, params=None, **kwargs):
+            calls.append(url)
+            if len(calls) > 1:
+                raise httpx.ReadTimeout("timed out")
+            yield httpx.Response(
+                200,
+                content=orjson.dumps({"results": [{"application_number": "NDA1"}]}),
+                request=httpx.Request(method, f"{FDAAPIClient.BASE_URL}{url}", params=params)
+            )
+        
+        with patch.object(fda_client.client, "stream", stream):
+            await fda_client.search_drugs(brand_name="Advil")
+            fda_client._fetch_long.cache_clear()
+            result = await fda_client.search_drugs(brand_name="Advil")
+        
+        assert result.success is True
+        assert result.data == [{"application_number": "NDA1"}]
+        assert result.metadata["stale"] is True
+    
+    @pytest.mark.asyncio
+    async def test_client_error_not_served_stale(self, fda_client):
+        """Test a 4xx is reported rather than masked by the last good result."""
+        outcomes = iter([(200, [{"recall_number": "D-1"}]), (404, [])])
+        
+        with patch.object(fda_client.client, "stream", mock_stream(lambda params: next(outcomes))):
+            await fda_client.search_recalls(product_description="aspirin")
+            fda_client._fetch_normal.cache_clear()
+            result = await fda_client.search_recalls(product_description="aspirin")
+        
+        assert result.success is False
+    
+    @pytest.mark.asyncio
+    async def test_server_error_without_stale_entry(self, fda_client):
+        """Test a 5xx with nothing cached is reported as a failure."""
+        with patch.object(fda_client.client, "stream", mock_stream(lambda params: (503, []))):
+            result = await fda_client.search_recalls(product_description="aspirin")
+        
+        assert result.success is False
+        assert "503" in result.error
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,14 +1,79 @@
 """SEC EDGAR API client for accessing SEC company filings and data."""
 
+import asyncio
 import re
-from typing import Dict, Any, List, Optional
+import time
+from itertools import islice
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 import httpx
-from dotenv import load_dotenv
+import orjson
+from async_lru import alru_cache
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+)
 
 from .models import SECResponse, CompanyInfo, Filing, COMMON_FORM_TYPES
 
-# Load environment variables
-load_dotenv()
+_NON_DIGIT_RE = re.compile(r"\D")
+
+# Throttling and gateway errors EDGAR recovers from on its own
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_backoff = wait_exponential(multiplier=0.5, max=8) + wait_random(0, 0.5)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Return True for failures worth retrying: transport errors, 429 and 5xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """Wait for the server's Retry-After seconds when given, else back off exponentially."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = exc.response.headers.get("Retry-After", "")
+        if retry_after.isascii() and retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+    return _backoff(retry_state)
+
+
+class _TokenBucket:
+    """Async token bucket that spaces request starts to a sustained rate."""
+    
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a request may start, then consume one token."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+class _CompanyIndex(NamedTuple):
+    """Lookup tables over company_tickers.json, built once per download."""
+    
+    by_ticker: Dict[str, Dict[str, Any]]
+    by_cik: Dict[str, List[Dict[str, Any]]]
+    titles: List[Tuple[str, Dict[str, Any]]]
 
 
 class SECAPIClient:
@@ -19,6 +84,7 @@ class SECAPIClient:
     
     BASE_URL = "https://data.sec.gov"
     EFTS_URL = "https://efts.sec.gov/LATEST"
+    TICKERS_TTL = 24 * 60 * 60  # company_tickers.json is regenerated daily
     
     def __init__(self, user_agent: str = "US-Data-MCP-SEC-Server/0.1.0 (Contact: user@example.com)"):
         """Initialize SEC API client.
@@ -26,7 +92,15 @@ class SECAPIClient:
         Args:
             user_agent: User-Agent header value. SEC requires a proper User-Agent.
         """
+        # One long-lived pool for every SEC request so TCP/TLS setup is paid once;
+        # pool and HTTP/2 settings live on the transport, which replaces the
+        # client's own. HTTP/2 lets concurrent fan-outs such as get_companies_filings
+        # multiplex over a single connection per host, still paced by the rate limiter below
         self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=30.0)
+            ),
             timeout=30.0,
             headers={
                 "User-Agent": user_agent,
@@ -34,9 +108,29 @@ class SECAPIClient:
             },
             follow_redirects=True
         )
+        
+        # SEC fair-access policy allows 10 requests/second. A bucket admits
+        # burst + rate requests in any one second, so use a single token and
+        # pace requests evenly just under the cap
+        self._limiter = _TokenBucket(rate=9.0, burst=1)
+        
+        # Index over company_tickers.json plus the validators used to revalidate it
+        self._tickers: Optional[_CompanyIndex] = None
+        self._tickers_fetched_at = 0.0
+        self._tickers_etag: Optional[str] = None
+        self._tickers_last_modified: Optional[str] = None
+        self._tickers_lock = asyncio.Lock()
+        
+        # Per-company document caches keyed by URL (so by normalized CIK): EDGAR
+        # rebuilds these at most a few times a day. Facts documents run to
+        # megabytes, so keep fewer of them; concurrent misses share one request
+        self._fetch_submissions = alru_cache(maxsize=256, ttl=3600)(self._fetch_json)
+        self._fetch_facts = alru_cache(maxsize=32, ttl=3600)(self._fetch_json)
     
     async def close(self) -> None:
         """Close the HTTP client."""
+        self._fetch_submissions.cache_clear()
+        self._fetch_facts.cache_clear()
         await self.client.aclose()
     
     async def __aenter__(self):
@@ -47,6 +141,41 @@ class SECAPIClient:
         """Async context manager exit."""
         await self.close()
     
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a rate-limited GET request to SEC, retrying transient failures.
+        
+        Args:
+            url: Request URL
+            **kwargs: Extra arguments for httpx.AsyncClient.get
+            
+        Returns:
+            HTTP response
+        """
+        # The only retry layer, connect errors included: the transport does not
+        # retry on its own, so every attempt waits for a rate-limiter token
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=_wait_retry_after,
+            retry=retry_if_exception(_is_transient),
+            reraise=True
+        ):
+            with attempt:
+                await self._limiter.acquire()
+                response = await self.client.get(url, **kwargs)
+                if response.status_code in _RETRY_STATUSES:
+                    response.raise_for_status()
+        return response
+    
+    async def _fetch_json(self, url: str) -> Dict[str, Any]:
+        """Fetch and decode a JSON document.
+        
+        Raises on any failure rather than returning an error value, so the
+        caches wrapping this method only ever hold successful responses.
+        """
+        response = await self._get(url)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
     def _normalize_cik(self, cik: str) -> str:
         """Normalize CIK to 10 digits with leading zeros.
         
@@ -56,10 +185,91 @@ class SECAPIClient:
         Returns:
             10-digit CIK with leading zeros
         """
-        # Remove any non-digit characters
-        cik_digits = re.sub(r'\D', '', cik)
-        # Pad with leading zeros to 10 digits
-        return cik_digits.zfill(10)
+        # Plain ASCII digit strings only need padding; otherwise strip non-digits
+        # first (isdigit alone also accepts characters like "²" that \D strips)
+        if cik.isascii() and cik.isdigit():
+            return cik.zfill(10)
+        return _NON_DIGIT_RE.sub("", cik).zfill(10)
+    
+    def _tickers_fresh(self) -> bool:
+        """Return True if the cached tickers payload is within its TTL."""
+        return (
+            self._tickers is not None
+            and time.monotonic() - self._tickers_fetched_at < self.TICKERS_TTL
+        )
+    
+    @staticmethod
+    def _build_company_index(data: Dict[str, Any]) -> _CompanyIndex:
+        """Build ticker, CIK and lowercased-title lookups from company_tickers.json.
+        
+        Args:
+            data: Parsed company_tickers.json
+            
+        Returns:
+            Company index whose entries are the search result rows
+        """
+        by_ticker: Dict[str, Dict[str, Any]] = {}
+        by_cik: Dict[str, List[Dict[str, Any]]] = {}
+        titles: List[Tuple[str, Dict[str, Any]]] = []
+        
+        for company in data.values():
+            ticker = company.get("ticker") or ""
+            title = company.get("title") or ""
+            # cik_str is an int in the published file; format it straight to the
+            # padded form and only fall back to string padding for anything else
+            cik_str = company.get("cik_str", "")
+            cik = f"{cik_str:010d}" if type(cik_str) is int else str(cik_str).zfill(10)
+            entry = {
+                "cik": cik,
+                "name": title,
+                "ticker": ticker.upper(),
+                "exchange": company.get("exchange", "")
+            }
+            # Some entries have no ticker; they are still found by CIK or title
+            if ticker:
+                by_ticker.setdefault(ticker.lower(), entry)
+            by_cik.setdefault(cik, []).append(entry)
+            titles.append((title.lower(), entry))
+        
+        return _CompanyIndex(by_ticker, by_cik, titles)
+    
+    async def _get_company_index(self) -> _CompanyIndex:
+        """Return the company index, downloading company tickers at most once per TTL.
+        
+        Once the TTL lapses the file is revalidated with a conditional GET, so an
+        unchanged file costs a 304 round trip instead of a full download and parse.
+        
+        Returns:
+            Company index over company_tickers.json
+        """
+        if self._tickers_fresh():
+            return self._tickers
+        
+        # Concurrent callers wait for a single refresh
+        async with self._tickers_lock:
+            if self._tickers_fresh():
+                return self._tickers
+            
+            headers = {}
+            if self._tickers is not None:
+                if self._tickers_etag:
+                    headers["If-None-Match"] = self._tickers_etag
+                if self._tickers_last_modified:
+                    headers["If-Modified-Since"] = self._tickers_last_modified
+            
+            url = f"{self.BASE_URL}/files/company_tickers.json"
+            response = await self._get(url, headers=headers)
+            
+            if response.status_code == 304 and self._tickers is not None:
+                self._tickers_fetched_at = time.monotonic()
+                return self._tickers
+            
+            response.raise_for_status()
+            self._tickers = self._build_company_index(orjson.loads(response.content))
+            self._tickers_etag = response.headers.get("ETag")
+            self._tickers_last_modified = response.headers.get("Last-Modified")
+            self._tickers_fetched_at = time.monotonic()
+            return self._tickers
     
     async def search_company(self, query: str) -> SECResponse:
         """Search for companies by name, ticker, or CIK.
@@ -71,33 +281,22 @@ class SECAPIClient:
             SECResponse with company information
         """
         try:
-            # Try to fetch company tickers data
-            url = f"{self.BASE_URL}/files/company_tickers.json"
-            response = await self.client.get(url)
-            response.raise_for_status()
+            # Company tickers index, cached across searches
+            index = await self._get_company_index()
+            query_lower = query.strip().lower()
             
-            data = response.json()
-            
-            # Search through companies
-            query_lower = query.lower()
-            matches = []
-            
-            for key, company in data.items():
-                ticker = company.get("ticker", "").lower()
-                title = company.get("title", "").lower()
-                cik = str(company.get("cik_str", ""))
-                
-                if (query_lower in title or 
-                    query_lower == ticker or 
-                    query in cik):
-                    matches.append({
-                        "cik": self._normalize_cik(cik),
-                        "name": company.get("title", ""),
-                        "ticker": company.get("ticker", "").upper(),
-                        "exchange": company.get("exchange", "")
-                    })
+            # CIK- and ticker-shaped queries are answered by a single dict probe;
+            # only fall back to scanning titles when that probe misses
+            if query_lower.isascii() and query_lower.isdigit():
+                matches = list(index.by_cik.get(query_lower.zfill(10), ()))
+            else:
+                ticker_match = index.by_ticker.get(query_lower)
+                matches = [ticker_match] if ticker_match is not None else []
             
-            return SECResponse(
+            if not matches:
+                matches = [entry for title, entry in index.titles if query_lower in title]
+            
+            return SECResponse.model_construct(
                 data=matches,
                 metadata={
                     "query": query,
@@ -127,12 +326,9 @@ class SECAPIClient:
             normalized_cik = self._normalize_cik(cik)
             url = f"{self.BASE_URL}/submissions/CIK{normalized_cik}.json"
             
-            response = await self.client.get(url)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._fetch_submissions(url)
             
-            return SECResponse(
+            return SECResponse.model_construct(
                 data=[data],
                 metadata={
                     "cik": normalized_cik,
@@ -174,7 +370,11 @@ class SECAPIClient:
             SECResponse with filings
         """
         try:
-            # Get submissions data
+            normalized_cik = self._normalize_cik(cik)
+            
+            # Get submissions data. filings.recent is nearly the whole document
+            # (filings.files only points at older pages), so streaming out just
+            # that subtree saves little over orjson and would bypass the cache
             submissions_response = await self.get_company_submissions(cik)
             
             if not submissions_response.success or not submissions_response.data:
@@ -198,35 +398,41 @@ class SECAPIClient:
             primary_docs = recent_filings.get("primaryDocument", [])
             primary_doc_descs = recent_filings.get("primaryDocDescription", [])
             
-            # Build filings list
+            # Pick the matching rows first, stopping at count, then build only those
+            rows = range(min(len(accession_numbers), len(form_types)))
+            if form_type:
+                indices = list(islice((i for i in rows if form_types[i] == form_type), count))
+            else:
+                indices = rows[:count]
+            
+            n_filing_dates = len(filing_dates)
+            n_report_dates = len(report_dates)
+            n_primary_docs = len(primary_docs)
+            n_primary_doc_descs = len(primary_doc_descs)
+            build_url = self._build_filing_url_fast
+            form_description = COMMON_FORM_TYPES.get
+            
+            # Hot loop: bound methods and per-row values are looked up once
             filings = []
-            for i in range(min(len(accession_numbers), len(form_types))):
-                filing_form = form_types[i]
-                
-                # Filter by form type if specified
-                if form_type and filing_form != form_type:
-                    continue
-                
-                filing = {
-                    "accession_number": accession_numbers[i],
-                    "filing_date": filing_dates[i] if i < len(filing_dates) else None,
-                    "report_date": report_dates[i] if i < len(report_dates) else None,
-                    "form_type": filing_form,
-                    "form_description": COMMON_FORM_TYPES.get(filing_form, "Unknown form type"),
-                    "primary_document": primary_docs[i] if i < len(primary_docs) else None,
-                    "primary_doc_description": primary_doc_descs[i] if i < len(primary_doc_descs) else None,
-                    "filing_url": self._build_filing_url(cik, accession_numbers[i])
-                }
-                
-                filings.append(filing)
-                
-                if len(filings) >= count:
-                    break
+            append = filings.append
+            for i in indices:
+                accession = accession_numbers[i]
+                form = form_types[i]
+                append({
+                    "accession_number": accession,
+                    "filing_date": filing_dates[i] if i < n_filing_dates else None,
+                    "report_date": report_dates[i] if i < n_report_dates else None,
+                    "form_type": form,
+                    "form_description": form_description(form, "Unknown form type"),
+                    "primary_document": primary_docs[i] if i < n_primary_docs else None,
+                    "primary_doc_description": primary_doc_descs[i] if i < n_primary_doc_descs else None,
+                    "filing_url": build_url(normalized_cik, accession)
+                })
             
-            return SECResponse(
+            return SECResponse.model_construct(
                 data=filings,
                 metadata={
-                    "cik": self._normalize_cik(cik),
+                    "cik": normalized_cik,
                     "company_name": submissions.get("name", ""),
                     "form_type": form_type,
                     "count": len(filings)
@@ -242,6 +448,47 @@ class SECAPIClient:
                 error=str(e)
             )
     
+    async def get_companies_filings(
+        self,
+        ciks: List[str],
+        form_type: Optional[str] = None,
+        count: int = 10
+    ) -> SECResponse:
+        """Get filings for several companies concurrently.
+        
+        Args:
+            ciks: Central Index Keys
+            form_type: Filing type filter (10-K, 10-Q, 8-K, etc.)
+            count: Number of filings to retrieve per company
+            
+        Returns:
+            SECResponse with one row of filings per company
+        """
+        responses = await asyncio.gather(
+            *(self.get_company_filings(cik, form_type, count) for cik in ciks)
+        )
+        
+        companies = [
+            {
+                "cik": response.metadata.get("cik", cik),
+                "company_name": response.metadata.get("company_name"),
+                "success": response.success,
+                "error": response.error,
+                "filings": response.data
+            }
+            for cik, response in zip(ciks, responses)
+        ]
+        
+        return SECResponse.model_construct(
+            data=companies,
+            metadata={
+                "form_type": form_type,
+                "companies": len(companies),
+                "failed": sum(not response.success for response in responses)
+            },
+            success=True
+        )
+    
     def _build_filing_url(self, cik: str, accession_number: str) -> str:
         """Build URL for filing documents.
         
@@ -252,16 +499,27 @@ class SECAPIClient:
         Returns:
             URL to filing documents
         """
-        normalized_cik = self._normalize_cik(cik)
-        # Remove dashes from accession number for URL
-        accession_no_dash = accession_number.replace("-", "")
+        return self._build_filing_url_fast(self._normalize_cik(cik), accession_number)
+    
+    @staticmethod
+    def _build_filing_url_fast(normalized_cik: str, accession_number: str) -> str:
+        """Build URL for filing documents from an already normalized CIK.
+        
+        Args:
+            normalized_cik: 10-digit Central Index Key
+            accession_number: Accession number
+            
+        Returns:
+            URL to filing documents
+        """
         return f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={normalized_cik}&type=&dateb=&owner=exclude&count=40&search_text="
     
-    async def get_company_facts(self, cik: str) -> SECResponse:
+    async def get_company_facts(self, cik: str, tags: Optional[List[str]] = None) -> SECResponse:
         """Get company facts (XBRL data).
         
         Args:
             cik: Central Index Key
+            tags: XBRL concept names to keep (e.g. Revenues, Assets); all if omitted
             
         Returns:
             SECResponse with company financial facts
@@ -270,18 +528,19 @@ class SECAPIClient:
             normalized_cik = self._normalize_cik(cik)
             url = f"{self.BASE_URL}/api/xbrl/companyfacts/CIK{normalized_cik}.json"
             
-            response = await self.client.get(url)
-            response.raise_for_status()
+            data = await self._fetch_facts(url)
+            metadata = {
+                "cik": normalized_cik,
+                "source": "company_facts",
+                "description": "XBRL financial data"
+            }
+            if tags:
+                data = self._select_facts(data, tags)
+                metadata["tags"] = tags
             
-            data = response.json()
-            
-            return SECResponse(
+            return SECResponse.model_construct(
                 data=[data],
-                metadata={
-                    "cik": normalized_cik,
-                    "source": "company_facts",
-                    "description": "XBRL financial data"
-                },
+                metadata=metadata,
                 success=True
             )
         
@@ -301,6 +560,24 @@ class SECAPIClient:
                 error=str(e)
             )
     
+    @staticmethod
+    def _select_facts(data: Dict[str, Any], tags: List[str]) -> Dict[str, Any]:
+        """Keep only the requested concepts from a company facts document.
+        
+        Args:
+            data: Parsed companyfacts JSON
+            tags: XBRL concept names, matched in every taxonomy (us-gaap, dei, ...)
+            
+        Returns:
+            Company facts with only the requested concepts
+        """
+        facts = {}
+        for taxonomy, concepts in data.get("facts", {}).items():
+            selected = {tag: concepts[tag] for tag in tags if tag in concepts}
+            if selected:
+                facts[taxonomy] = selected
+        return {**data, "facts": facts}
+    
     async def get_form_types_reference(self) -> Dict[str, str]:
         """Get reference of common SEC form types.
         
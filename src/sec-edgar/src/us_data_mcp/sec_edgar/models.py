@@ -18,6 +18,14 @@ class FilingsRequest(BaseModel):
     count: int = Field(default=10, description="Number of filings to retrieve", ge=1, le=100)
 
 
+class CompaniesFilingsRequest(BaseModel):
+    """Request model for filings across several companies."""
+    
+    ciks: List[str] = Field(..., description="Central Index Keys (CIKs)", min_length=1, max_length=50)
+    form_type: Optional[str] = Field(None, description="Filing type (10-K, 10-Q, 8-K, etc.)")
+    count: int = Field(default=10, description="Number of filings to retrieve per company", ge=1, le=100)
+
+
 class FilingContentRequest(BaseModel):
     """Request model for filing content."""
     
@@ -104,6 +112,22 @@ COMMON_FORM_TYPES = {
     "485BPOS": "Post-Effective Amendment (investment companies)",
 }
 
+# Form types in each reference category, matched by exact membership
+_FORM_TYPE_GROUPS = {
+    "Annual & Quarterly Reports": frozenset({"10-K", "10-Q", "8-K", "10-K/A", "10-Q/A"}),
+    "Registration & Offerings": frozenset({"S-1", "S-3", "S-4", "S-8", "424B"}),
+    "Proxy Materials": frozenset({"DEF 14A", "PRE 14A", "DEFA14A"}),
+    "Ownership Reports": frozenset({"3", "4", "5", "13F-HR", "13D", "13G"}),
+    "Foreign Companies": frozenset({"20-F", "6-K"})
+}
+
+# COMMON_FORM_TYPES grouped by category, built once at import
+FORM_TYPES_GROUPED = {
+    group: {k: v for k, v in COMMON_FORM_TYPES.items() if k in forms}
+    for group, forms in _FORM_TYPE_GROUPS.items()
+}
+
+
 # Major SIC Industry Categories
 SIC_CATEGORIES = {
     "0100-0999": "Agriculture, Forestry, and Fishing",
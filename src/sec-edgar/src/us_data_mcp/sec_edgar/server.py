@@ -4,22 +4,52 @@ This server provides MCP tools for accessing SEC EDGAR company filings and finan
 """
 
 import asyncio
-import json
-from typing import Any, Optional
+import os
+from typing import Any
 
+import orjson
+from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from us_data_mcp.common import SharedClient
+
 from .api_client import SECAPIClient
-from .models import CompanySearchRequest, FilingsRequest, COMMON_FORM_TYPES, DailyFilingsRequest, InsiderTradesRequest
+from .models import (
+    CompanySearchRequest,
+    FilingsRequest,
+    CompaniesFilingsRequest,
+    COMMON_FORM_TYPES,
+    FORM_TYPES_GROUPED,
+    DailyFilingsRequest,
+    InsiderTradesRequest
+)
+
+
+# Compact JSON by default; set US_DATA_MCP_PRETTY=1 for indented output when debugging
+_INDENT = 2 if os.getenv("US_DATA_MCP_PRETTY") else None
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 if _INDENT else 0
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON text."""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+
+# The form types reference is static, so serialize it once at import
+_FORM_TYPES_RESPONSE = _dumps({
+    "form_types": FORM_TYPES_GROUPED,
+    "all_types": COMMON_FORM_TYPES,
+    "usage": "Use these form type codes in the 'form_type' parameter of get_company_filings"
+})
 
 
 # Initialize MCP server
 app = Server("us-data-mcp.sec-edgar")
 
 # Global API client
-sec_client: Optional[SECAPIClient] = None
+sec_client = SharedClient(SECAPIClient)
 
 
 @app.list_tools()
@@ -75,11 +105,41 @@ async def list_tools() -> list[Tool]:
                 "required": ["cik"]
             }
         ),
+        Tool(
+            name="get_companies_filings",
+            description=(
+                "Get SEC filings for several companies at once by CIK. Fetches all companies "
+                "concurrently and returns each company's recent filings, optionally filtered by form type."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ciks": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Company CIKs (up to 50)"
+                    },
+                    "form_type": {
+                        "type": "string",
+                        "description": "Optional: Filter by form type (10-K, 10-Q, 8-K, DEF 14A, etc.)"
+                    },
+                    "count": {
+                        "type": "integer",
+                        "description": "Number of filings per company (default: 10, max: 100)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 100
+                    }
+                },
+                "required": ["ciks"]
+            }
+        ),
         Tool(
             name="get_company_facts",
             description=(
                 "Get company financial facts (XBRL data) from SEC. "
-                "Returns structured financial statement data including revenue, assets, liabilities, etc."
+                "Returns structured financial statement data including revenue, assets, liabilities, etc. "
+                "Pass tags to return only specific concepts; full fact sets can be several megabytes."
             ),
             inputSchema={
                 "type": "object",
@@ -87,6 +147,11 @@ async def list_tools() -> list[Tool]:
                     "cik": {
                         "type": "string",
                         "description": "Company CIK (Central Index Key)"
+                    },
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional: XBRL concepts to return (e.g., ['Revenues', 'Assets', 'NetIncomeLoss'])"
                     }
                 },
                 "required": ["cik"]
@@ -157,8 +222,6 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     Returns:
         List of text content responses
     """
-    global sec_client
-    
     try:
         if name == "search_company":
             # Validate request
@@ -167,22 +230,20 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({
+                    text=_dumps({
                         "success": False,
                         "error": f"Invalid parameters: {str(e)}"
-                    }, indent=2)
+                    })
                 )]
             
-            # Initialize client if needed
-            if sec_client is None:
-                sec_client = SECAPIClient()
+            client = await sec_client.get()
             
             # Search for company
-            response = await sec_client.search_company(request.query)
+            response = await client.search_company(request.query)
             
             return [TextContent(
                 type="text",
-                text=json.dumps(response.model_dump(), indent=2)
+                text=response.model_dump_json(indent=_INDENT)
             )]
         
         elif name == "get_company_filings":
@@ -192,18 +253,16 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({
+                    text=_dumps({
                         "success": False,
                         "error": f"Invalid parameters: {str(e)}"
-                    }, indent=2)
+                    })
                 )]
             
-            # Initialize client if needed
-            if sec_client is None:
-                sec_client = SECAPIClient()
+            client = await sec_client.get()
             
             # Get filings
-            response = await sec_client.get_company_filings(
+            response = await client.get_company_filings(
                 cik=request.cik,
                 form_type=request.form_type,
                 count=request.count
@@ -211,7 +270,34 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(response.model_dump(), indent=2)
+                text=response.model_dump_json(indent=_INDENT)
+            )]
+        
+        elif name == "get_companies_filings":
+            # Validate request
+            try:
+                request = CompaniesFilingsRequest(**arguments)
+            except Exception as e:
+                return [TextContent(
+                    type="text",
+                    text=_dumps({
+                        "success": False,
+                        "error": f"Invalid parameters: {str(e)}"
+                    })
+                )]
+            
+            client = await sec_client.get()
+            
+            # Get filings for all companies
+            response = await client.get_companies_filings(
+                ciks=request.ciks,
+                form_type=request.form_type,
+                count=request.count
+            )
+            
+            return [TextContent(
+                type="text",
+                text=response.model_dump_json(indent=_INDENT)
             )]
         
         elif name == "get_company_facts":
@@ -220,98 +306,64 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             if not cik:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({
+                    text=_dumps({
                         "success": False,
                         "error": "CIK is required"
-                    }, indent=2)
+                    })
                 )]
             
-            # Initialize client if needed
-            if sec_client is None:
-                sec_client = SECAPIClient()
+            client = await sec_client.get()
             
             # Get company facts
-            response = await sec_client.get_company_facts(cik)
+            response = await client.get_company_facts(cik, arguments.get("tags"))
             
             return [TextContent(
                 type="text",
-                text=json.dumps(response.model_dump(), indent=2)
+                text=response.model_dump_json(indent=_INDENT)
             )]
         
         elif name == "get_form_types":
             # Return form types reference
-            form_types_grouped = {
-                "Annual & Quarterly Reports": {
-                    k: v for k, v in COMMON_FORM_TYPES.items()
-                    if any(x in k for x in ["10-K", "10-Q", "8-K"])
-                },
-                "Registration & Offerings": {
-                    k: v for k, v in COMMON_FORM_TYPES.items()
-                    if k.startswith("S-") or "424" in k
-                },
-                "Proxy Materials": {
-                    k: v for k, v in COMMON_FORM_TYPES.items()
-                    if "14A" in k
-                },
-                "Ownership Reports": {
-                    k: v for k, v in COMMON_FORM_TYPES.items()
-                    if k in ["3", "4", "5", "13F-HR", "13D", "13G"]
-                },
-                "Foreign Companies": {
-                    k: v for k, v in COMMON_FORM_TYPES.items()
-                    if k in ["20-F", "6-K"]
-                }
-            }
-            
-            return [TextContent(
-                type="text",
-                text=json.dumps({
-                    "form_types": form_types_grouped,
-                    "all_types": COMMON_FORM_TYPES,
-                    "usage": "Use these form type codes in the 'form_type' parameter of get_company_filings"
-                }, indent=2)
-            )]
+            return [TextContent(type="text", text=_FORM_TYPES_RESPONSE)]
         
         elif name == "get_daily_filings":
             request = DailyFilingsRequest(**arguments)
-            if sec_client is None:
-                sec_client = SECAPIClient()
-            response = await sec_client.get_daily_filings(request.date)
-            return [TextContent(type="text", text=json.dumps(response.model_dump(), indent=2))]
+            client = await sec_client.get()
+            response = await client.get_daily_filings(request.date)
+            return [TextContent(type="text", text=response.model_dump_json(indent=_INDENT))]
 
         elif name == "get_insider_trades":
             request = InsiderTradesRequest(**arguments)
-            if sec_client is None:
-                sec_client = SECAPIClient()
-            response = await sec_client.get_insider_trades(request.cik, request.limit)
-            return [TextContent(type="text", text=json.dumps(response.model_dump(), indent=2))]
+            client = await sec_client.get()
+            response = await client.get_insider_trades(request.cik, request.limit)
+            return [TextContent(type="text", text=response.model_dump_json(indent=_INDENT))]
         
         else:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "success": False,
                     "error": f"Unknown tool: {name}"
-                }, indent=2)
+                })
             )]
     
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "success": False,
                 "error": f"Error executing tool: {str(e)}"
-            }, indent=2)
+            })
         )]
 
 
 async def main():
     """Main entry point for the SEC EDGAR MCP server."""
-    global sec_client
+    load_dotenv()
     
     try:
         # Initialize SEC API client (no API key needed)
-        sec_client = SECAPIClient()
+        await sec_client.get()
         
         # Run server
         async with stdio_server() as (read_stream, write_stream):
@@ -322,8 +374,7 @@ async def main():
             )
     finally:
         # Cleanup
-        if sec_client:
-            await sec_client.close()
+        await sec_client.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,392 @@
+"""Tests for SEC EDGAR API client."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from us_data_mcp.sec_edgar import api_client
+from us_data_mcp.sec_edgar.api_client import SECAPIClient, _TokenBucket
+
+
+_real_sleep = asyncio.sleep
+
+URL = "https://data.sec.gov/submissions/CIK0000320193.json"
+
+
+def mock_get(*outcomes):
+    """Build a stand-in for AsyncClient.get that replays responses or raises errors.
+    
+    Each outcome is an exception to raise or a (status_code, headers) pair.
+    """
+    def respond(url, **kwargs):
+        outcome = next(replies)
+        if isinstance(outcome, Exception):
+            raise outcome
+        status_code, headers = outcome
+        return httpx.Response(status_code, headers=headers, json={}, request=httpx.Request("GET", url))
+    
+    replies = iter(outcomes)
+    return AsyncMock(side_effect=respond)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps on it."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await _real_sleep(0)
+
+
+@pytest.fixture
+def clock():
+    """Fixture that runs the client's clock and all sleeps on a FakeClock."""
+    fake = FakeClock()
+    with patch.object(api_client, "time", SimpleNamespace(monotonic=fake.monotonic)), \
+            patch.object(asyncio, "sleep", fake.sleep):
+        yield fake
+
+
+class TestTokenBucket:
+    """Test cases for _TokenBucket."""
+    
+    @pytest.mark.asyncio
+    async def test_paces_requests_at_rate(self, clock):
+        """Test back-to-back requests start 1/rate seconds apart after the first."""
+        bucket = _TokenBucket(rate=9.0, burst=1)
+        
+        starts = []
+        for _ in range(10):
+            await bucket.acquire()
+            starts.append(clock.now)
+        
+        assert starts[0] == 0.0
+        for earlier, later in zip(starts, starts[1:]):
+            assert later - earlier == pytest.approx(1 / 9)
+        # Never more than rate + burst starts in any one second
+        assert sum(start < 1.0 for start in starts) <= 10
+        assert starts[-1] == pytest.approx(1.0)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_are_spaced(self, clock):
+        """Test concurrent acquirers are admitted one at a time at the sustained rate."""
+        bucket = _TokenBucket(rate=9.0, burst=1)
+        starts = []
+        
+        async def request():
+            await bucket.acquire()
+            starts.append(clock.now)
+        
+        await asyncio.gather(*(request() for _ in range(19)))
+        
+        assert starts == sorted(starts)
+        assert starts[-1] == pytest.approx(2.0)
+        assert sum(start < 1.0 for start in starts) == 9
+    
+    @pytest.mark.asyncio
+    async def test_client_stays_under_sec_rate_cap(self, clock):
+        """Test the client's limiter never starts more than 10 requests in a second."""
+        client = SECAPIClient()
+        
+        starts = []
+        for _ in range(30):
+            await client._limiter.acquire()
+            starts.append(clock.now)
+        await client.close()
+        
+        for i, start in enumerate(starts):
+            assert sum(start <= other < start + 1.0 for other in starts[i:]) <= 10
+    
+    @pytest.mark.asyncio
+    async def test_idle_time_does_not_bank_more_than_burst(self, clock):
+        """Test a long idle period refills only up to the burst size."""
+        bucket = _TokenBucket(rate=9.0, burst=1)
+        await bucket.acquire()
+        clock.now += 60.0
+        
+        await bucket.acquire()
+        assert clock.now == 60.0
+        await bucket.acquire()
+        assert clock.now == pytest.approx(60.0 + 1 / 9)
+
+
+@pytest.fixture
+async def sec_client(clock):
+    """Fixture for SEC API client running on the fake clock."""
+    client = SECAPIClient()
+    yield client
+    await client.close()
+
+
+class TestRetries:
+    """Test cases for SECAPIClient._get retries."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [429, 503])
+    async def test_retry_after_is_honoured(self, sec_client, clock, status_code):
+        """Test a throttled or unavailable response waits the server's Retry-After."""
+        get = mock_get((status_code, {"Retry-After": "3"}), (200, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            response = await sec_client._get(URL)
+        
+        assert response.status_code == 200
+        assert get.call_count == 2
+        assert clock.sleeps == [3.0]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [429, 503])
+    async def test_backs_off_without_retry_after(self, sec_client, clock, status_code):
+        """Test a retryable response without Retry-After uses jittered exponential backoff."""
+        get = mock_get((status_code, {}), (status_code, {}), (200, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            response = await sec_client._get(URL)
+        
+        assert response.status_code == 200
+        assert get.call_count == 3
+        first, second = clock.sleeps
+        assert 0.5 <= first <= 1.0
+        assert 1.0 <= second <= 1.5
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_is_capped(self, sec_client, clock):
+        """Test a long Retry-After is capped at 30 seconds."""
+        get = mock_get((503, {"Retry-After": "3600"}), (200, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            await sec_client._get(URL)
+        
+        assert clock.sleeps == [30.0]
+    
+    @pytest.mark.asyncio
+    async def test_non_numeric_retry_after_falls_back_to_backoff(self, sec_client, clock):
+        """Test an HTTP-date Retry-After is ignored in favour of backoff."""
+        get = mock_get((429, {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}), (200, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            await sec_client._get(URL)
+        
+        assert 0.5 <= clock.sleeps[0] <= 1.0
+    
+    @pytest.mark.asyncio
+    async def test_non_ascii_digit_retry_after_falls_back_to_backoff(self, sec_client, clock):
+        """Test a Retry-After of digit-like characters float() rejects is ignored."""
+        get = mock_get((503, {"Retry-After": "²".encode("latin-1")}), (200, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            response = await sec_client._get(URL)
+        
+        assert response.status_code == 200
+        assert 0.5 <= clock.sleeps[0] <= 1.0
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_three_attempts(self, sec_client, clock):
+        """Test persistent throttling is raised after the third attempt."""
+        get = mock_get(*[(429, {"Retry-After": "1"})] * 3)
+        
+        with patch.object(sec_client.client, "get", get):
+            with pytest.raises(httpx.HTTPStatusError):
+                await sec_client._get(URL)
+        
+        assert get.call_count == 3
+        assert clock.sleeps == [1.0, 1.0]
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, sec_client, clock):
+        """Test a 404 is returned to the caller without retrying."""
+        get = mock_get((404, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            response = await sec_client._get(URL)
+        
+        assert response.status_code == 404
+        assert get.call_count == 1
+        assert clock.sleeps == []
+    
+    @pytest.mark.asyncio
+    async def test_connect_errors_are_retried(self, sec_client, clock):
+        """Test connection failures are retried with backoff."""
+        get = mock_get(httpx.ConnectError("refused"), httpx.ConnectError("refused"), (200, {}))
+        
+        with patch.object(sec_client.client, "get", get):
+            response = await sec_client._get(URL)
+        
+        assert response.status_code == 200
+        assert get.call_count == 3
+        assert len(clock.sleeps) == 2
+
+
+TICKERS = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+    "2": {"cik_str": 1067983, "ticker": "BRK-B", "title": "BERKSHIRE HATHAWAY INC"},
+    "3": {"cik_str": 1067983, "ticker": "BRK-A", "title": "BERKSHIRE HATHAWAY INC"},
+    "4": {"cik_str": 9, "ticker": "HATH", "title": "Hath Co"},
+    "5": {"cik_str": 1234, "ticker": "", "title": "Tickerless Trust"},
+}
+
+
+def mock_tickers(payload=TICKERS):
+    """Build a stand-in for AsyncClient.get that serves company_tickers.json."""
+    return AsyncMock(side_effect=lambda url, **kwargs: httpx.Response(
+        200, json=payload, request=httpx.Request("GET", url)
+    ))
+
+
+def found(result):
+    """Return (ticker, cik) pairs from a search result."""
+    return [(row["ticker"], row["cik"]) for row in result.data]
+
+
+class TestSearchCompany:
+    """Test cases for SECAPIClient.search_company and the company index."""
+    
+    def test_index_pads_ciks(self):
+        """Test every index entry carries a 10-digit zero-padded CIK."""
+        index = SECAPIClient._build_company_index(TICKERS)
+        
+        assert index.by_ticker["aapl"]["cik"] == "0000320193"
+        assert index.by_ticker["hath"]["cik"] == "0000000009"
+        assert [entry["ticker"] for entry in index.by_cik["0001067983"]] == ["BRK-B", "BRK-A"]
+    
+    def test_index_skips_empty_tickers(self):
+        """Test entries without a ticker stay out of the ticker lookup."""
+        index = SECAPIClient._build_company_index(TICKERS)
+        
+        assert "" not in index.by_ticker
+        assert index.by_cik["0000001234"][0]["name"] == "Tickerless Trust"
+    
+    @pytest.mark.asyncio
+    async def test_ticker_match_is_case_insensitive(self, sec_client):
+        """Test tickers match regardless of case and surrounding whitespace."""
+        with patch.object(sec_client.client, "get", mock_tickers()):
+            for query in ("aapl", "AAPL", " Aapl "):
+                result = await sec_client.search_company(query)
+                assert found(result) == [("AAPL", "0000320193")]
+    
+    @pytest.mark.asyncio
+    async def test_ticker_takes_precedence_over_title(self, sec_client):
+        """Test an exact ticker hit is returned without title substring matches."""
+        with patch.object(sec_client.client, "get", mock_tickers()):
+            result = await sec_client.search_company("hath")
+        
+        assert found(result) == [("HATH", "0000000009")]
+    
+    @pytest.mark.asyncio
+    async def test_cik_lookup_pads_query(self, sec_client):
+        """Test short and padded CIK queries find every ticker for that company."""
+        with patch.object(sec_client.client, "get", mock_tickers()):
+            for query in ("1067983", "0001067983"):
+                result = await sec_client.search_company(query)
+                assert found(result) == [("BRK-B", "0001067983"), ("BRK-A", "0001067983")]
+    
+    @pytest.mark.asyncio
+    async def test_non_ascii_digit_query_is_not_a_cik(self, sec_client):
+        """Test digit-like characters such as superscripts do not take the CIK lookup."""
+        with patch.object(sec_client.client, "get", mock_tickers()):
+            result = await sec_client.search_company("1067983²")
+        
+        assert result.success is True
+        assert found(result) == []
+    
+    @pytest.mark.asyncio
+    async def test_normalize_cik_strips_non_ascii_digits(self, sec_client):
+        """Test CIKs are padded, with anything but ASCII digits stripped first."""
+        assert sec_client._normalize_cik("320193") == "0000320193"
+        assert sec_client._normalize_cik("CIK 320-193") == "0000320193"
+        assert sec_client._normalize_cik("12²") == "0000000012"
+    
+    @pytest.mark.asyncio
+    async def test_title_match_is_case_insensitive(self, sec_client):
+        """Test queries that are not a ticker or CIK match title substrings in any case."""
+        with patch.object(sec_client.client, "get", mock_tickers()):
+            result = await sec_client.search_company("Microsoft")
+            tickerless = await sec_client.search_company("tickerless")
+        
+        assert found(result) == [("MSFT", "0000789019")]
+        assert found(tickerless) == [("", "0000001234")]
+    
+    @pytest.mark.asyncio
+    async def test_index_downloaded_once(self, sec_client):
+        """Test the tickers file is fetched once and reused across searches."""
+        get = mock_tickers()
+        
+        with patch.object(sec_client.client, "get", get):
+            await sec_client.search_company("aapl")
+            await sec_client.search_company("msft")
+        
+        assert get.call_count == 1
+
+
+SUBMISSIONS = {
+    "cik": "320193",
+    "name": "Apple Inc.",
+    "filings": {
+        "recent": {
+            "accessionNumber": ["0000320193-24-000001", "0000320193-24-000002", "0000320193-24-000003"],
+            "filingDate": ["2024-01-03", "2024-01-02", "2024-01-01"],
+            "reportDate": ["2023-12-31", "", ""],
+            "form": ["10-K", "4", "4"],
+            "primaryDocument": ["a.htm", "b.xml", "c.xml"],
+            "primaryDocDescription": ["10-K", "FORM 4", "FORM 4"]
+        }
+    }
+}
+
+
+def mock_submissions():
+    """Build a stand-in for AsyncClient.get that knows one company's submissions."""
+    def respond(url, **kwargs):
+        if url.endswith("/CIK0000320193.json"):
+            return httpx.Response(200, json=SUBMISSIONS, request=httpx.Request("GET", url))
+        return httpx.Response(404, request=httpx.Request("GET", url))
+    return AsyncMock(side_effect=respond)
+
+
+class TestCompaniesFilings:
+    """Test cases for SECAPIClient.get_companies_filings."""
+    
+    @pytest.mark.asyncio
+    async def test_one_row_per_company_in_order(self, sec_client):
+        """Test each company gets its own row and a failure does not sink the others."""
+        with patch.object(sec_client.client, "get", mock_submissions()):
+            result = await sec_client.get_companies_filings(["999", "320193"], form_type="4", count=5)
+        
+        assert result.success is True
+        assert result.metadata["companies"] == 2
+        assert result.metadata["failed"] == 1
+        
+        missing, apple = result.data
+        assert missing["success"] is False
+        assert missing["filings"] == []
+        assert apple["cik"] == "0000320193"
+        assert apple["company_name"] == "Apple Inc."
+        assert [filing["accession_number"] for filing in apple["filings"]] == [
+            "0000320193-24-000002",
+            "0000320193-24-000003",
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_repeated_cik_fetched_once(self, sec_client):
+        """Test the same company requested twice shares one submissions download."""
+        get = mock_submissions()
+        
+        with patch.object(sec_client.client, "get", get):
+            result = await sec_client.get_companies_filings(["320193", "0000320193"])
+        
+        assert [len(row["filings"]) for row in result.data] == [3, 3]
+        assert get.call_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])